@@ -0,0 +1,114 @@
+import logging
+import re
+import time
+
+import tabulate
+
+from utils.registry import shared
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+
+
+def _normalize_transcript(text: str) -> str:
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+def _agreement(reference: list, candidate: list) -> float:
+    if not reference:
+        return 0.0
+    return sum(a == b for a, b in zip(reference, candidate)) / len(reference)
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def text_parity(texts: list[str], backend: str, batch_size: int = 32) -> dict:
+    from text.models import TextEmotionModel
+
+    reference_model = shared(TextEmotionModel, "cpu", backend="torch")
+    candidate_model = shared(TextEmotionModel, "cpu", backend=backend)
+
+    reference, reference_s = _timed(reference_model.predict_many, texts, batch_size)
+    candidate, candidate_s = _timed(candidate_model.predict_many, texts, batch_size)
+
+    return {
+        "items": len(texts),
+        "models": {
+            "text_emotion": {
+                "agreement": _agreement(
+                    [r["label"] for r in reference], [c["label"] for c in candidate]
+                ),
+                "reference_s": reference_s,
+                "candidate_s": candidate_s,
+            }
+        },
+    }
+
+
+def audio_parity(paths: list[str], backend: str) -> dict:
+    from voice.audio import AudioClip
+    from voice.models import SpeechToTextModel, VoiceEmotionModel
+
+    clips = [AudioClip.load(path) for path in paths]
+    report = {"items": len(clips), "models": {}}
+
+    for name, cls, method, key in (
+        ("voice_emotion", VoiceEmotionModel, "predict_many", "label"),
+        ("transcription", SpeechToTextModel, "transcribe_many", None),
+    ):
+        reference_model = shared(cls, "cpu", backend="torch")
+        candidate_model = shared(cls, "cpu", backend=backend)
+        reference, reference_s = _timed(getattr(reference_model, method), clips)
+        candidate, candidate_s = _timed(getattr(candidate_model, method), clips)
+
+        if key is None:
+            reference = [_normalize_transcript(r) for r in reference]
+            candidate = [_normalize_transcript(c) for c in candidate]
+        else:
+            reference = [r[key] for r in reference]
+            candidate = [c[key] for c in candidate]
+
+        report["models"][name] = {
+            "agreement": _agreement(reference, candidate),
+            "reference_s": reference_s,
+            "candidate_s": candidate_s,
+        }
+    return report
+
+
+def parity_report(config: dict, backend: str, sample: int = 50, seed: int = 0) -> dict:
+    from data.loader import load_audio_dataset, load_csv
+
+    dataset = config.get("dataset", "")
+    mode = config.get("mode", "text")
+    logging.info(f"Checking {backend} against torch on {sample} {mode} items of {dataset}")
+
+    if mode == "text":
+        texts = load_csv(dataset, limit=sample, random=True, seed=seed)
+        report = text_parity(texts, backend, config.get("batch_size", 32))
+    else:
+        entries = load_audio_dataset(dataset, limit=sample, random=True, seed=seed)
+        paths = [path for entry in entries for path in entry["files"]][:sample]
+        report = audio_parity(paths, backend)
+
+    return {"dataset": dataset, "mode": mode, "backend": backend, **report}
+
+
+def log_parity(reports: list[dict]):
+    table = [
+        [
+            report["dataset"],
+            report["backend"],
+            name,
+            report["items"],
+            f"{stats['agreement']:.1%}",
+            f"{stats['reference_s'] / max(stats['candidate_s'], 1e-9):.2f}x",
+        ]
+        for report in reports
+        for name, stats in report["models"].items()
+    ]
+    headers = ["Dataset", "Backend", "Model", "Items", "Agreement", "Speedup"]
+    print(tabulate.tabulate(table, headers=headers, tablefmt="grid"))
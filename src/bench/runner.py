@@ -0,0 +1,172 @@
+import json
+import logging
+import math
+import os
+import platform
+import tempfile
+import time
+
+import tabulate
+
+from bench.synthetic import synthetic_audio_dataset, synthetic_texts
+from utils.profiler import PROFILER
+
+MIN_CLIP_SECONDS = 1.0
+MAX_CLIP_SECONDS = 4.0
+FILES_PER_SET = 2
+
+_DEFAULT_THREADS = None
+
+
+def run_benchmark(
+    modes: list[str],
+    batch_sizes: list[int],
+    workers: list[int],
+    items: int,
+    backend: str = "stub",
+    seed: int = 0,
+    spectrogram_formats: list[str] | None = None,
+    concurrent: bool = False,
+) -> dict:
+    report = {
+        "backend": backend,
+        "created": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "items": items,
+        "concurrent": concurrent,
+        "runs": [],
+    }
+    PROFILER.enable()
+
+    with tempfile.TemporaryDirectory() as root:
+        texts = synthetic_texts(items, seed) if "text" in modes else []
+        audio_dataset = []
+        if "audio" in modes:
+            logging.info(f"Generating {items} synthetic audio clips")
+            audio_dataset = synthetic_audio_dataset(
+                os.path.join(root, "audio"),
+                sets=math.ceil(items / FILES_PER_SET),
+                files_per_set=FILES_PER_SET,
+                min_seconds=MIN_CLIP_SECONDS,
+                max_seconds=MAX_CLIP_SECONDS,
+                seed=seed,
+            )
+
+        for mode in modes:
+            for batch_size in batch_sizes:
+                for worker_count in workers:
+                    logging.info(
+                        f"Benchmarking {mode} with batch size {batch_size} "
+                        f"and {worker_count} workers"
+                    )
+                    _set_threads(worker_count)
+                    if mode == "text":
+                        run = _bench_text(texts, batch_size, worker_count, backend)
+                    else:
+                        run = _bench_audio(
+                            audio_dataset,
+                            os.path.join(root, f"spectrograms-{batch_size}-{worker_count}"),
+                            batch_size,
+                            worker_count,
+                            backend,
+                            spectrogram_formats or ["png"],
+                            concurrent,
+                        )
+                    report["runs"].append(run)
+
+    return report
+
+
+def _bench_text(texts: list[str], batch_size: int, workers: int, backend: str) -> dict:
+    from text.pipeline import TextAnalysisPipeline
+
+    pipeline = TextAnalysisPipeline(batch_size=batch_size, backend=backend)
+    pipeline.analyze_many(texts[:batch_size])
+
+    PROFILER.reset()
+    start = time.perf_counter()
+    results = pipeline.analyze_many(texts)
+    return _run_report("text", batch_size, workers, len(results), start)
+
+
+def _bench_audio(
+    audio_dataset: list[dict],
+    spectrogram_dir: str,
+    batch_size: int,
+    workers: int,
+    backend: str,
+    spectrogram_formats: list[str],
+    concurrent: bool,
+) -> dict:
+    from voice.pipeline import VoiceAnalysisPipeline
+    from voice.spectrogram import SpectrogramWriter
+
+    max_batch_seconds = batch_size * (MIN_CLIP_SECONDS + MAX_CLIP_SECONDS) / 2
+    spectrograms = SpectrogramWriter(
+        spectrogram_dir, workers=workers, formats=spectrogram_formats
+    )
+    pipeline = VoiceAnalysisPipeline(
+        spectrograms=spectrograms,
+        max_batch_seconds=max_batch_seconds,
+        backend=backend,
+        concurrent=concurrent,
+    )
+    pipeline.analyze_many(audio_dataset[0])
+
+    PROFILER.reset()
+    start = time.perf_counter()
+    with spectrograms:
+        count = sum(1 for _ in pipeline.analyze_entries(audio_dataset))
+    run = _run_report("audio", batch_size, workers, count, start)
+    run["max_batch_seconds"] = max_batch_seconds
+    return run
+
+
+def _run_report(mode: str, batch_size: int, workers: int, items: int, start: float):
+    wall = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "batch_size": batch_size,
+        "workers": workers,
+        "items": items,
+        "wall_s": wall,
+        "items_per_s": items / wall if wall > 0 else 0.0,
+        "stages": PROFILER.summary(),
+    }
+
+
+def _set_threads(workers: int):
+    global _DEFAULT_THREADS
+    import torch
+
+    if _DEFAULT_THREADS is None:
+        _DEFAULT_THREADS = torch.get_num_threads()
+    torch.set_num_threads(workers if workers > 0 else _DEFAULT_THREADS)
+
+
+def save_report(report: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    logging.info(f"Benchmark report saved to {path}")
+
+
+def log_report(report: dict):
+    table = [
+        [
+            run["mode"],
+            run["batch_size"],
+            run["workers"],
+            run["items"],
+            f"{run['wall_s']:.2f}",
+            f"{run['items_per_s']:.1f}",
+            ", ".join(
+                f"{name} {stats['p95_ms']:.1f}" for name, stats in run["stages"].items()
+            ),
+        ]
+        for run in report["runs"]
+    ]
+    headers = ["Mode", "Batch", "Workers", "Items", "Wall (s)", "Items/s", "p95 (ms)"]
+    print(tabulate.tabulate(table, headers=headers, tablefmt="grid"))
@@ -0,0 +1,97 @@
+import math
+import os
+import struct
+import wave
+from random import Random
+
+OPENERS = (
+    "I think",
+    "Honestly",
+    "My friends and I agree that",
+    "After fifty hours I can say",
+    "We played it all weekend and",
+    "The reviews said",
+)
+SUBJECTS = (
+    "the combat",
+    "the story",
+    "this game",
+    "the soundtrack",
+    "the multiplayer",
+    "the level design",
+)
+VERDICTS = (
+    "is absolutely amazing and worth every cent",
+    "is not good at all and crashes constantly",
+    "was boring after the first hour",
+    "made me feel nervous in the best way",
+    "is fine but nothing special really",
+    "is a disgusting cash grab with microtransactions",
+    "surprised me with how polished it is",
+)
+ENDINGS = ("", " 10/10.", " Would not recommend.", " Highly recommended!", " Meh.")
+
+
+def synthetic_texts(count: int, seed: int = 0) -> list[str]:
+    rng = Random(seed)
+    return [
+        f"{rng.choice(OPENERS)} {rng.choice(SUBJECTS)} {rng.choice(VERDICTS)}."
+        f"{rng.choice(ENDINGS)}"
+        for _ in range(count)
+    ]
+
+
+def write_synthetic_wav(
+    path: str,
+    seconds: float,
+    rng: Random,
+    sampling_rate: int = 16000,
+):
+    frequency = rng.uniform(110, 330)
+    amplitude = rng.uniform(0.1, 0.6)
+    syllable = rng.uniform(3, 6)
+    frames = bytearray()
+    for i in range(int(seconds * sampling_rate)):
+        t = i / sampling_rate
+        envelope = 0.5 * (1 - math.cos(2 * math.pi * syllable * t))
+        sample = amplitude * envelope * math.sin(2 * math.pi * frequency * t)
+        sample += rng.gauss(0, 0.01)
+        frames += struct.pack("<h", int(max(-1.0, min(1.0, sample)) * 32767))
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sampling_rate)
+        f.writeframes(bytes(frames))
+
+
+def synthetic_audio_dataset(
+    root: str,
+    sets: int,
+    files_per_set: int = 2,
+    min_seconds: float = 1.0,
+    max_seconds: float = 4.0,
+    seed: int = 0,
+) -> list[dict]:
+    rng = Random(seed)
+    dataset = []
+    for i in range(sets):
+        set_id = f"synthetic-{i:04d}"
+        folder = os.path.join(root, set_id)
+        os.makedirs(folder, exist_ok=True)
+        files = []
+        for j in range(files_per_set):
+            path = os.path.join(folder, f"{j}.wav")
+            write_synthetic_wav(path, rng.uniform(min_seconds, max_seconds), rng)
+            files.append(path)
+        dataset.append(
+            {
+                "set_id": set_id,
+                "files": files,
+                "text": "",
+                "gender": rng.choice(["male", "female"]),
+                "age": rng.randint(18, 70),
+                "country": rng.choice(["Portugal", "Brazil", "Ukraine", "India"]),
+            }
+        )
+    return dataset
@@ -1,11 +1,14 @@
 import json
 import os
 from pathlib import Path
-from typing import Dict, List
+from random import Random
+from typing import Dict, Iterator, List
 
 import pandas as pd
 
-from data.preprocessing import clean_text, min_length
+from data.preprocessing import clean_series, min_length_mask
+
+AUDIO_ROOT = "datasets/audio/files"
 
 
 def load_csv(
@@ -13,26 +16,64 @@ def load_csv(
     text_column: str = "text",
     limit: int | None = None,
     random: bool = False,
+    seed: int | None = None,
+    chunksize: int = 10_000,
 ) -> list[str]:
-    df = pd.read_csv(Path(path))
-
-    if text_column not in df.columns:
+    columns = pd.read_csv(Path(path), nrows=0).columns
+    if text_column not in columns:
         raise ValueError(f"Column '{text_column}' not found in dataset")
 
-    texts = []
+    texts = iter_csv_texts(path, text_column, chunksize)
 
     if random:
-        df = df.sample(frac=1).reset_index(drop=True)
+        return sample_texts(texts, limit, seed)
 
-    for raw_text in df[text_column]:
-        cleaned = clean_text(str(raw_text))
-        if min_length(cleaned):
-            texts.append(cleaned)
-
-        if limit and len(texts) >= limit:
+    selected = []
+    for cleaned in texts:
+        selected.append(cleaned)
+        if limit and len(selected) >= limit:
             break
 
-    return texts
+    return selected
+
+
+def iter_csv_texts(
+    path: str, text_column: str = "text", chunksize: int = 10_000
+) -> Iterator[str]:
+    with pd.read_csv(Path(path), usecols=[text_column], chunksize=chunksize) as reader:
+        for chunk in reader:
+            cleaned = clean_series(chunk[text_column])
+            yield from cleaned[min_length_mask(cleaned)]
+
+
+def sample_texts(
+    texts: Iterator[str], limit: int | None = None, seed: int | None = None
+) -> list[str]:
+    reservoir = TextReservoir(limit, seed)
+    for text in texts:
+        reservoir.add(text)
+    return reservoir.sample()
+
+
+class TextReservoir:
+    def __init__(self, limit: int | None = None, seed: int | None = None):
+        self.limit = limit
+        self.seen = 0
+        self._rng = Random(seed)
+        self._sample = []
+
+    def add(self, text: str):
+        if not self.limit or len(self._sample) < self.limit:
+            self._sample.append(text)
+        else:
+            j = self._rng.randint(0, self.seen)
+            if j < self.limit:
+                self._sample[j] = text
+        self.seen += 1
+
+    def sample(self) -> list[str]:
+        self._rng.shuffle(self._sample)
+        return self._sample
 
 
 def load_result(path: str) -> list[dict]:
@@ -58,16 +99,26 @@ def load_audio_csv(folder: str) -> List[str]:
 
 def load_audio_dataset(
     csv_path: str,
-    audio_root: str = "datasets/audio/files",
+    audio_root: str = AUDIO_ROOT,
     limit: int | None = None,
     random: bool = False,
+    seed: int | None = None,
+    manifest: bool = True,
+    rescan: bool = False,
 ) -> List[Dict]:
+    if manifest:
+        from data.manifest import AudioManifest
+
+        with AudioManifest(csv_path, audio_root) as index:
+            index.refresh(rescan=rescan)
+            return index.entries(limit=limit, random=random, seed=seed)
+
     df = pd.read_csv(csv_path)
 
     df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
 
     if random and limit is not None:
-        df = df.sample(n=limit).reset_index(drop=True)
+        df = df.sample(n=limit, random_state=seed).reset_index(drop=True)
     elif limit is not None:
         df = df.head(limit)
 
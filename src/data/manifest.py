@@ -0,0 +1,221 @@
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import CACHE_DIR
+
+MANIFEST_PATH = os.path.join(CACHE_DIR, "audio_manifest.sqlite")
+METADATA_COLUMNS = ("text", "gender", "age", "country")
+
+
+def _mtime(path: str | Path) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def _value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class AudioManifest:
+    def __init__(self, csv_path: str, audio_root: str, path: str = MANIFEST_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.csv_path = os.path.abspath(csv_path)
+        self.audio_root = audio_root
+        self.source = f"{self.csv_path}\x00{os.path.abspath(audio_root)}"
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "source TEXT PRIMARY KEY, csv_mtime REAL, root_mtime REAL);"
+            "CREATE TABLE IF NOT EXISTS sets ("
+            "source TEXT NOT NULL, position INTEGER NOT NULL, set_id, "
+            "text, gender, age, country, dir_mtime REAL, "
+            "PRIMARY KEY (source, position));"
+            "CREATE TABLE IF NOT EXISTS files ("
+            "source TEXT NOT NULL, set_id, path TEXT NOT NULL, "
+            "duration REAL, sample_rate INTEGER, size INTEGER, mtime REAL, "
+            "PRIMARY KEY (source, path));"
+            "CREATE INDEX IF NOT EXISTS files_set ON files (source, set_id);"
+        )
+        self._conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def refresh(self, rescan: bool = False) -> bool:
+        csv_mtime = _mtime(self.csv_path)
+        if csv_mtime is None:
+            raise FileNotFoundError(f"Dataset not found: {self.csv_path}")
+        root_mtime = _mtime(self.audio_root)
+
+        row = self._conn.execute(
+            "SELECT csv_mtime, root_mtime FROM sources WHERE source = ?",
+            (self.source,),
+        ).fetchone()
+        if not rescan and row == (csv_mtime, root_mtime):
+            return False
+
+        if row is None or row[0] != csv_mtime:
+            self._load_csv()
+        scanned = self._scan(rescan)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+            (self.source, csv_mtime, root_mtime),
+        )
+        self._conn.commit()
+        logging.info(f"Audio manifest refreshed: rescanned {scanned} set folders")
+        return True
+
+    def _load_csv(self):
+        df = pd.read_csv(self.csv_path)
+        df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
+        known = dict(
+            self._conn.execute(
+                "SELECT set_id, dir_mtime FROM sets WHERE source = ?", (self.source,)
+            )
+        )
+        self._conn.execute("DELETE FROM sets WHERE source = ?", (self.source,))
+
+        columns = [
+            df[column] if column in df else [None] * len(df)
+            for column in METADATA_COLUMNS
+        ]
+        rows = []
+        for position, (set_id, *metadata) in enumerate(zip(df["set_id"], *columns)):
+            set_id = _value(set_id)
+            rows.append(
+                (
+                    self.source,
+                    position,
+                    set_id,
+                    *(_value(value) for value in metadata),
+                    known.get(set_id),
+                )
+            )
+        self._conn.executemany("INSERT INTO sets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _scan(self, rescan: bool = False) -> int:
+        folders = dict(
+            self._conn.execute(
+                "SELECT set_id, dir_mtime FROM sets WHERE source = ?", (self.source,)
+            )
+        )
+        scanned = 0
+        for set_id, known_mtime in folders.items():
+            folder = Path(self.audio_root) / str(set_id)
+            dir_mtime = _mtime(folder) if folder.is_dir() else None
+            if not rescan and dir_mtime is not None and dir_mtime == known_mtime:
+                continue
+            if dir_mtime is None:
+                self._conn.execute(
+                    "DELETE FROM files WHERE source = ? AND set_id = ?",
+                    (self.source, set_id),
+                )
+            else:
+                self._scan_set(set_id, folder)
+                scanned += 1
+            self._conn.execute(
+                "UPDATE sets SET dir_mtime = ? WHERE source = ? AND set_id = ?",
+                (dir_mtime, self.source, set_id),
+            )
+        return scanned
+
+    def _scan_set(self, set_id, folder: Path):
+        import soundfile as sf
+
+        known = {
+            path: (size, mtime)
+            for path, size, mtime in self._conn.execute(
+                "SELECT path, size, mtime FROM files WHERE source = ? AND set_id = ?",
+                (self.source, set_id),
+            )
+        }
+        seen = set()
+        for file in folder.glob("*.wav"):
+            path = str(file)
+            seen.add(path)
+            stat = file.stat()
+            if known.get(path) == (stat.st_size, stat.st_mtime):
+                continue
+            try:
+                info = sf.info(path)
+                duration, sample_rate = info.frames / info.samplerate, info.samplerate
+            except RuntimeError as e:
+                logging.warning(f"Could not read audio header of {path}: {e}")
+                duration, sample_rate = None, None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.source,
+                    set_id,
+                    path,
+                    duration,
+                    sample_rate,
+                    stat.st_size,
+                    stat.st_mtime,
+                ),
+            )
+        for path in known.keys() - seen:
+            self._conn.execute(
+                "DELETE FROM files WHERE source = ? AND path = ?", (self.source, path)
+            )
+
+    def entries(
+        self, limit: int | None = None, random: bool = False, seed: int | None = None
+    ) -> list[dict]:
+        rows = self._conn.execute(
+            "SELECT set_id, text, gender, age, country FROM sets "
+            "WHERE source = ? ORDER BY position",
+            (self.source,),
+        ).fetchall()
+
+        # Same row selection as DataFrame.sample / head on the metadata CSV.
+        if random and limit is not None:
+            state = np.random if seed is None else np.random.RandomState(seed)
+            rows = [rows[i] for i in state.choice(len(rows), size=limit, replace=False)]
+        elif limit is not None:
+            rows = rows[:limit]
+
+        files = {}
+        for set_id, path in self._conn.execute(
+            "SELECT set_id, path FROM files WHERE source = ? ORDER BY path",
+            (self.source,),
+        ):
+            files.setdefault(set_id, []).append(path)
+
+        return [
+            {
+                "set_id": set_id,
+                "files": files[set_id],
+                "text": "" if text is None else text,
+                "gender": "" if gender is None else gender,
+                "age": age,
+                "country": "" if country is None else country,
+            }
+            for set_id, text, gender, age, country in rows
+            if files.get(set_id)
+        ]
+
+    def summary(self) -> dict:
+        sets, files, seconds, size = self._conn.execute(
+            "SELECT COUNT(DISTINCT set_id), COUNT(*), COALESCE(SUM(duration), 0), "
+            "COALESCE(SUM(size), 0) FROM files WHERE source = ?",
+            (self.source,),
+        ).fetchone()
+        return {"sets": sets, "files": files, "seconds": seconds, "bytes": size}
@@ -1,20 +1,59 @@
 import re
+from typing import Iterable, Iterator
+
+import pandas as pd
+
+_DISALLOWED = re.compile(r"[^a-zA-Z0-9.,!?;:'\"()\s]")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\S+")
 
 
 def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    text = re.sub(r"[^a-zA-Z0-9.,!?;:'\"()\s]", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _DISALLOWED.sub(" ", text)
+    text = _WHITESPACE.sub(" ", text)
     text = text.strip()
 
     return text
 
 
+def clean_series(texts: pd.Series) -> pd.Series:
+    texts = texts.astype(str)
+    texts = texts.str.replace(_DISALLOWED, " ", regex=True)
+    texts = texts.str.replace(_WHITESPACE, " ", regex=True)
+    return texts.str.strip()
+
+
 def min_length(text: str, min_length: int = 5) -> bool:
     return bool(text) and len(text.split()) >= min_length
 
 
+def min_length_mask(texts: pd.Series, min_length: int = 5) -> pd.Series:
+    return texts.str.count(_WORD) >= min_length
+
+
 def truncate_text(text: str, max_chars: int = 2000) -> str:
     return text[:max_chars]
+
+
+def deduplicate(texts: list[str]) -> tuple[list[str], list[int]]:
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+    return list(uniques), codes.tolist()
+
+
+def expand(results: Iterable, inverse: list[int]) -> Iterator:
+    last = {index: position for position, index in enumerate(inverse)}
+    results = iter(results)
+    pending = {}
+    produced = 0
+
+    for position, index in enumerate(inverse):
+        while produced <= index:
+            pending[produced] = next(results)
+            produced += 1
+        if last[index] == position:
+            yield pending.pop(index)
+        else:
+            yield pending[index]
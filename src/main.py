@@ -1,39 +1,83 @@
 import argparse
+import json
 import logging
 import os
+import shutil
 import sys
+import tempfile
 import time
+from contextlib import nullcontext
 
+from utils.importtime import ImportTimer
 
-from data.loader import load_audio_dataset, load_csv
-from text.pipeline import TextAnalysisPipeline
-from utils.file import load_jsons, save_results
+IMPORT_TIMER = ImportTimer().install() if "--importtime" in sys.argv else None
+
+from utils.file import (
+    RESULTS_EXTENSIONS,
+    ResultsWriter,
+    find_files,
+    iter_results,
+    load_jsons,
+    results_path,
+    save_columnar_results,
+)
 from utils.logger import log_audio_results, log_text_results, set_log_file, setup_logger
-from voice.pipeline import VoiceAnalysisPipeline
+from utils.planner import plan_runs
+from utils.profiler import PROFILER
+from utils.registry import log_footprints
+from utils.runner import (
+    analyze_items,
+    build_pipelines,
+    log_stats,
+    open_cache,
+    open_spectrograms,
+    pipeline_stats,
+    spectrogram_dir,
+    stats_delta,
+)
 
 
-def run_command(config_paths):
+def run_command(config_paths, profile=False, workers=None, resume=False):
     files = load_jsons(config_paths)
     if not files:
         logging.error("No valid configuration files found. Exiting.")
         sys.exit(1)
 
+    if profile:
+        PROFILER.enable()
+
     for i, (name, configs) in enumerate(files.items(), 1):
         results = []
         logging.info(
             f"Running file {i}/{len(files)}: {name} with {len(configs)} configurations"
         )
-        for j, config in enumerate(configs, 1):
-            logging.info(f"Running configuration {j}/{len(configs)}")
-            result = run(config)
-            if result:
-                results.append(result)
+        if workers is not None:
+            configs = [{**config, "workers": workers} for config in configs]
+        if resume:
+            configs = [{**config, "resume": True} for config in configs]
+        for j, group in enumerate(plan_runs(configs), 1):
+            if len(group) == 1:
+                logging.info(f"Running configuration {j} on {group[0].get('dataset')}")
+                result = run(group[0])
+                if result:
+                    results.append(result)
+                continue
+            logging.info(
+                f"Running {len(group)} configurations together on "
+                f"{group[0].get('dataset')}"
+            )
+            results.extend(run_group(group))
         logging.info(f"Completed running {len(results)}/{len(configs)} configurations.")
     logging.info("All groups completed.")
+    log_footprints()
 
 
-def load_command(results_path):
-    files = load_jsons(results_path)
+def load_command(paths, summary=False):
+    if summary:
+        summary_command(paths)
+        return
+
+    files = load_jsons(paths, RESULTS_EXTENSIONS)
     logging.info(f"Loaded {len(files)} results files for plotting.")
     if not files:
         logging.error("No valid results files found. Exiting.")
@@ -49,6 +93,84 @@ def load_command(results_path):
             log_text_results(results)
 
 
+def summary_command(paths):
+    from utils.columnar import COLUMNAR_EXTENSIONS, load_frame, log_summary
+
+    groups = find_files(paths, (*RESULTS_EXTENSIONS, *COLUMNAR_EXTENSIONS))
+    for filepath in (path for group in groups for path in group):
+        try:
+            frame = load_frame(filepath)
+        except Exception as e:
+            logging.error(f"Error loading {filepath}: {e}")
+            continue
+        log_summary(os.path.basename(filepath), frame)
+
+
+def serve_command(args):
+    from serving.server import serve
+
+    config = {}
+    if args.config:
+        configs = next(iter(load_jsons([args.config]).values()), [])
+        config = dict(configs[0]) if configs else {}
+    if args.backend:
+        config["backend"] = args.backend
+    config["mode"] = "audio" if args.audio else "text"
+
+    serve(
+        config,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue=args.max_queue,
+        request_timeout=args.timeout,
+    )
+
+
+def bench_command(args):
+    from bench.runner import log_report, run_benchmark, save_report
+
+    report = run_benchmark(
+        modes=args.mode,
+        batch_sizes=args.batch_sizes,
+        workers=args.workers,
+        items=args.items,
+        backend=args.backend,
+        seed=args.seed,
+        spectrogram_formats=args.spectrogram_formats,
+        concurrent=args.concurrent,
+    )
+    output = args.output or os.path.join(
+        "results", f"bench_{str(int(time.time() * 1000))}.json"
+    )
+    save_report(report, output)
+    log_report(report)
+
+
+def parity_command(args):
+    from bench.parity import log_parity, parity_report
+
+    files = load_jsons(args.config)
+    reports = []
+    for configs in files.values():
+        for config in configs:
+            backend = args.backend or config.get("backend", "torch")
+            if backend in ("torch", "stub"):
+                logging.info(f"Skipping {config.get('dataset')}: backend is {backend}")
+                continue
+            reports.append(parity_report(config, backend, args.sample, args.seed))
+
+    if not reports:
+        logging.warning("No configurations with a quantized or onnx backend.")
+        return
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(reports, f, indent=4)
+        logging.info(f"Parity report saved to {args.output}")
+    log_parity(reports)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Affective Computing")
     subparsers = parser.add_subparsers(dest="command")
@@ -64,10 +186,35 @@ def main():
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         default="INFO",
     )
+    run_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Shard each dataset across N worker processes",
+    )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted runs from their checkpoints",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report per-stage latency percentiles and save raw timings",
+    )
 
     load_parser = subparsers.add_parser("load", help="Load results from saved files")
     load_parser.add_argument(
-        "results", type=str, nargs="+", help="Results JSON file(s)"
+        "results",
+        type=str,
+        nargs="+",
+        help="Results JSON/JSONL (or Parquet/Arrow with --summary) file(s)",
+    )
+    load_parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Print label distributions and cross-tabs instead of every row",
     )
     load_parser.add_argument(
         "-l",
@@ -77,59 +224,371 @@ def main():
         default="INFO",
     )
 
+    bench_parser = subparsers.add_parser(
+        "bench", help="Benchmark the pipelines on synthetic data"
+    )
+    bench_parser.add_argument(
+        "--mode", type=str, nargs="+", choices=["text", "audio"], default=["text"]
+    )
+    bench_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    bench_parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="Torch threads and spectrogram processes per run (0 keeps the defaults)",
+    )
+    bench_parser.add_argument("--items", type=int, default=64)
+    bench_parser.add_argument(
+        "--backend",
+        type=str,
+        default="stub",
+        help="Model backend, 'stub' runs without downloading any model",
+    )
+    bench_parser.add_argument("--seed", type=int, default=0)
+    bench_parser.add_argument(
+        "--spectrogram-formats", type=str, nargs="*", default=["png"]
+    )
+    bench_parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Overlap independent audio stages across threads",
+    )
+    bench_parser.add_argument("-o", "--output", type=str, help="Report JSON path")
+    bench_parser.add_argument(
+        "-l",
+        "--log_level",
+        type=str,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+    )
+
+    parity_parser = subparsers.add_parser(
+        "parity", help="Compare a quantized/onnx backend against fp32 torch"
+    )
+    parity_parser.add_argument(
+        "config", type=str, nargs="+", help="Config file(s) or directories"
+    )
+    parity_parser.add_argument(
+        "--backend",
+        type=str,
+        choices=["quantized", "onnx"],
+        help="Backend to check (defaults to each configuration's backend)",
+    )
+    parity_parser.add_argument("--sample", type=int, default=50)
+    parity_parser.add_argument("--seed", type=int, default=0)
+    parity_parser.add_argument("-o", "--output", type=str, help="Report JSON path")
+    parity_parser.add_argument(
+        "-l",
+        "--log_level",
+        type=str,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve text and audio analysis over local HTTP"
+    )
+    serve_parser.add_argument(
+        "config",
+        type=str,
+        nargs="?",
+        help="Config file whose first configuration sets the pipeline options",
+    )
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--backend", type=str, help="Override the model backend")
+    serve_parser.add_argument(
+        "--audio", action="store_true", help="Also load the audio models"
+    )
+    serve_parser.add_argument("--max-batch-size", type=int, default=32)
+    serve_parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=10.0,
+        help="How long a request waits for others to join its batch",
+    )
+    serve_parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=256,
+        help="Pending requests per queue before answering 503",
+    )
+    serve_parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Per-request timeout in seconds"
+    )
+    serve_parser.add_argument(
+        "-l",
+        "--log_level",
+        type=str,
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+    )
+
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="Report how long project modules and their dependencies take to import",
+    )
+
     args = parser.parse_args()
-    if args.command not in ["run", "load"]:
+    if args.command not in ["run", "load", "bench", "parity", "serve"]:
         parser.print_help()
         sys.exit(1)
 
     setup_logger(args.log_level)
     if args.command == "run":
-        run_command(args.config)
+        run_command(
+            args.config, profile=args.profile, workers=args.workers, resume=args.resume
+        )
     elif args.command == "load":
-        load_command(args.results)
+        load_command(args.results, summary=args.summary)
+    elif args.command == "bench":
+        bench_command(args)
+    elif args.command == "parity":
+        parity_command(args)
+    elif args.command == "serve":
+        serve_command(args)
+
+    if IMPORT_TIMER is not None:
+        IMPORT_TIMER.report()
     return
 
 
-def run(config):
+def load_items(config) -> list:
     dataset = config.get("dataset", "")
-    dataset_name = os.path.splitext(os.path.basename(dataset))[0]
     mode = config.get("mode", "text")
     limit = config.get("limit", None)
     random = config.get("random", False)
+    seed = config.get("seed", None)
 
-    results = []
-    texts = []
-    audio_dataset = []
+    from data.loader import load_audio_dataset, load_csv
 
     if mode == "text":
-        texts = load_csv(dataset, text_column="text", limit=limit, random=random)
+        return load_csv(
+            dataset, text_column="text", limit=limit, random=random, seed=seed
+        )
     elif mode == "audio":
-        audio_dataset = load_audio_dataset(csv_path=dataset, limit=limit, random=random)
+        return load_audio_dataset(
+            csv_path=dataset,
+            limit=limit,
+            random=random,
+            seed=seed,
+            manifest=config.get("manifest", True),
+            rescan=config.get("manifest_rescan", False),
+        )
     else:
         raise ValueError("Provide a valid mode: 'text' or 'audio'")
 
-    if mode == "text":
-        if not texts:
-            logging.warning("No texts to analyze.")
-            return
-        pipeline = TextAnalysisPipeline()
-        results = pipeline.analyze_many(texts)
 
-        save_results(results, dataset_name)
+def open_checkpoint(config):
+    if not (config.get("checkpoint", True) or config.get("resume", False)):
+        return None
+    from utils.checkpoint import Checkpoint
 
-        log_text_results(results)
+    return Checkpoint(config)
 
-    elif mode == "audio":
-        if not audio_dataset:
-            logging.warning("No audio files to analyze.")
-            return
-        pipeline = VoiceAnalysisPipeline()
-        for entry in audio_dataset:
-            results = pipeline.analyze_many(entry)
-
-        save_results(results, dataset_name)
-        log_audio_results(results)
-    return results
+
+def unfinished(checkpoint, config) -> bool:
+    if checkpoint is None or config.get("resume", False) or not checkpoint.exists():
+        return False
+    logging.error(
+        f"Run {checkpoint.run_id} has an unfinished checkpoint in {checkpoint.path}. "
+        "Rerun with --resume to continue it, or remove that folder to start over. "
+        "Skipping this configuration."
+    )
+    return True
+
+
+def analyze_all(config, items: list, output_dir, checkpoint, consume) -> dict:
+    workers = config.get("workers", 1)
+    if workers > 1:
+        from utils.sharding import ShardedRunner
+
+        runner = ShardedRunner(config, workers, output_dir=output_dir)
+        consume(resumable(checkpoint, items, runner.analyze))
+        return runner.stats
+
+    cache = open_cache(config)
+    spectrograms = None
+    if output_dir is not None:
+        spectrograms = open_spectrograms(config, output_dir)
+    text_pipeline, voice_pipeline = build_pipelines(config, cache, spectrograms)
+    before = pipeline_stats(text_pipeline)
+
+    with spectrograms or nullcontext():
+        consume(
+            resumable(
+                checkpoint,
+                items,
+                lambda pending: analyze_items(text_pipeline, voice_pipeline, pending),
+            )
+        )
+
+    stats = stats_delta(pipeline_stats(text_pipeline), before)
+    if cache is not None:
+        cache.close()
+    return stats
+
+
+def log_run(config, filepath: str):
+    if config.get("columnar"):
+        save_columnar_results(filepath, config["columnar"])
+
+    if config.get("mode", "text") == "text":
+        log_text_results(iter_results(filepath))
+    else:
+        log_audio_results(iter_results(filepath))
+
+
+def run(config):
+    dataset = config.get("dataset", "")
+    dataset_name = os.path.splitext(os.path.basename(dataset))[0]
+    mode = config.get("mode", "text")
+
+    checkpoint = open_checkpoint(config)
+    if unfinished(checkpoint, config):
+        return None
+    if checkpoint is not None and config.get("resume", False) and checkpoint.exists():
+        filepath, loaded = checkpoint.restore()
+    else:
+        loaded = load_items(config)
+        filepath = results_path(dataset_name)
+        if checkpoint is not None and loaded:
+            checkpoint.start(filepath, loaded)
+
+    if mode == "text" and not loaded:
+        logging.warning("No texts to analyze.")
+        return
+    if mode == "audio" and not loaded:
+        logging.warning("No audio files to analyze.")
+        return
+
+    items = loaded
+    inverse = None
+    if mode == "text" and config.get("deduplicate", True):
+        from data.preprocessing import deduplicate
+
+        items, inverse = deduplicate(loaded)
+        logging.info(f"Deduplicated {len(loaded)} texts to {len(items)} unique")
+    output_dir = spectrogram_dir(filepath) if mode == "audio" else None
+    PROFILER.reset()
+
+    def write(results):
+        with ResultsWriter(filepath) as writer:
+            writer.write_many(fan_out(results, inverse))
+
+    stats = analyze_all(config, items, output_dir, checkpoint, write)
+
+    if checkpoint is not None:
+        checkpoint.complete()
+    log_run(config, filepath)
+
+    log_stats(config, stats)
+    if PROFILER.enabled:
+        PROFILER.save(f"{os.path.splitext(filepath)[0]}.timings.jsonl")
+        PROFILER.log_summary()
+    return filepath
+
+
+def run_group(configs: list[dict]) -> list[str]:
+    from utils.checkpoint import VOLATILE_KEYS
+    from utils.planner import (
+        ResultStore,
+        link_spectrograms,
+        select_items,
+        union_items,
+    )
+
+    base = configs[0]
+    dataset_name = os.path.splitext(os.path.basename(base.get("dataset", "")))[0]
+    mode = base.get("mode", "text")
+
+    plan = {
+        "plan": [
+            {key: value for key, value in config.items() if key not in VOLATILE_KEYS}
+            for config in configs
+        ]
+    }
+    checkpoint = open_checkpoint({**base, **plan})
+    if unfinished(checkpoint, base):
+        return []
+    restored = (
+        checkpoint is not None and base.get("resume", False) and checkpoint.exists()
+    )
+    if restored:
+        filepaths, selections = checkpoint.restore()
+    else:
+        selections = select_items(configs)
+        filepaths = []
+        for _ in configs:
+            filepath = results_path(dataset_name)
+            while filepath in filepaths:
+                filepath = results_path(dataset_name)
+            filepaths.append(filepath)
+
+    union = union_items(selections)
+    if not union:
+        logging.warning(f"No items to analyze in {base.get('dataset')}.")
+        return []
+    if checkpoint is not None and not restored:
+        checkpoint.start(filepaths, selections)
+
+    requested = sum(len(items) for items in selections)
+    logging.info(
+        f"Planned {len(configs)} configurations on {base.get('dataset')}: "
+        f"{requested} requested items, {len(union)} analyzed once"
+    )
+    output_dir = None
+    if mode == "audio":
+        output_dir = (
+            os.path.join(checkpoint.path, "spectrograms")
+            if checkpoint is not None
+            else tempfile.mkdtemp(prefix="spectrograms_")
+        )
+    PROFILER.reset()
+
+    with ResultStore() as store:
+        stats = analyze_all(
+            base,
+            union,
+            output_dir,
+            checkpoint,
+            lambda results: store.put_all(union, results),
+        )
+        for config, items, filepath in zip(configs, selections, filepaths):
+            with ResultsWriter(filepath) as writer:
+                for item in items:
+                    writer.write_many(store.get(item))
+            if output_dir is not None:
+                link_spectrograms(output_dir, spectrogram_dir(filepath), items)
+
+    if checkpoint is not None:
+        checkpoint.complete()
+    elif output_dir is not None:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    for config, filepath in zip(configs, filepaths):
+        log_run(config, filepath)
+
+    log_stats(base, stats)
+    if PROFILER.enabled:
+        PROFILER.save(f"{os.path.splitext(filepaths[0])[0]}.timings.jsonl")
+        PROFILER.log_summary()
+    return filepaths
+
+
+def resumable(checkpoint, items: list, analyze):
+    if checkpoint is None:
+        return analyze(items)
+    return checkpoint.analyze(items, analyze)
+
+
+def fan_out(results, inverse: list[int] | None):
+    if inverse is None:
+        return results
+    from data.preprocessing import expand
+
+    return expand(results, inverse)
 
 
 if __name__ == "__main__":
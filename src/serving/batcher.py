@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Callable
+
+from utils.profiler import percentile
+
+_STOP = object()
+
+
+class QueueFull(Exception):
+    pass
+
+
+class BatchMetrics:
+    def __init__(self, window: int = 2048):
+        self.requests = 0
+        self.rejected = 0
+        self.failed = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+        self.queue_wait = deque(maxlen=window)
+        self.latency = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_batch(self, size: int, waits: list[float], latencies: list[float]):
+        with self._lock:
+            self.batches += 1
+            self.requests += size
+            self.batch_sizes[size] += 1
+            self.queue_wait.extend(waits)
+            self.latency.extend(latencies)
+
+    def record_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+    def record_failed(self, size: int):
+        with self._lock:
+            self.failed += size
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            sizes = dict(sorted(self.batch_sizes.items()))
+            waits = [(value, 1) for value in self.queue_wait]
+            latencies = [(value, 1) for value in self.latency]
+            requests, batches = self.requests, self.batches
+            rejected, failed = self.rejected, self.failed
+
+        return {
+            "requests": requests,
+            "rejected": rejected,
+            "failed": failed,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "batch_sizes": sizes,
+            **{
+                f"{name}_p{q}_ms": percentile(values, q) * 1000
+                for name, values in (("queue_wait", waits), ("latency", latencies))
+                for q in (50, 95, 99)
+            },
+        }
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[list], list],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        max_queue: int = 256,
+        lock=None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = BatchMetrics()
+        self._lock = lock or threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(
+            target=self._loop, name=f"batcher-{name}", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def capacity(self) -> int:
+        return self._queue.maxsize
+
+    def submit(self, item) -> Future:
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            self.metrics.record_rejected()
+            raise QueueFull(f"{self.name} queue is full ({self._queue.maxsize} pending)")
+        return future
+
+    def close(self, timeout: float | None = None):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            self._run(batch)
+            if stopping:
+                return
+
+    def _run(self, batch: list):
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        started = time.perf_counter()
+        items = [item for item, _, _ in batch]
+        try:
+            with self._lock:
+                outcomes = [(True, result) for result in self.handler(items)]
+        except Exception as e:
+            if len(items) == 1:
+                logging.error(f"{self.name} request failed: {e}")
+                outcomes = [(False, e)]
+            else:
+                logging.warning(
+                    f"{self.name} batch of {len(items)} failed, "
+                    "retrying its items one by one"
+                )
+                outcomes = [self._run_one(item) for item in items]
+
+        finished = time.perf_counter()
+        succeeded = []
+        for (_, future, enqueued), (ok, outcome) in zip(batch, outcomes):
+            if ok:
+                future.set_result(outcome)
+                succeeded.append(enqueued)
+            else:
+                future.set_exception(outcome)
+        if len(succeeded) < len(batch):
+            self.metrics.record_failed(len(batch) - len(succeeded))
+        if succeeded:
+            self.metrics.record_batch(
+                len(batch),
+                [started - enqueued for enqueued in succeeded],
+                [finished - enqueued for enqueued in succeeded],
+            )
+
+    def _run_one(self, item) -> tuple[bool, object]:
+        try:
+            with self._lock:
+                return True, self.handler([item])[0]
+        except Exception as e:
+            logging.error(f"{self.name} request failed: {e}")
+            return False, e
@@ -0,0 +1,177 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from serving.batcher import MicroBatcher, QueueFull
+from utils.registry import loaded_models
+from utils.runner import build_pipelines, open_cache
+
+
+class AnalysisServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        batchers: dict[str, MicroBatcher],
+        request_timeout: float = 60.0,
+    ):
+        super().__init__(address, AnalysisHandler)
+        self.batchers = batchers
+        self.request_timeout = request_timeout
+        self.started = time.time()
+
+    def metrics(self) -> dict:
+        return {
+            "uptime_s": time.time() - self.started,
+            "queues": {
+                name: {
+                    "depth": batcher.depth,
+                    "max_batch_size": batcher.max_batch_size,
+                    "max_wait_ms": batcher.max_wait * 1000,
+                    **batcher.metrics.snapshot(),
+                }
+                for name, batcher in self.batchers.items()
+            },
+            "models": [
+                {key: value for key, value in model.items() if key != "args"}
+                for model in loaded_models()
+            ],
+        }
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    server: AnalysisServer
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "queues": list(self.server.batchers)})
+        elif self.path == "/metrics":
+            self._send(200, self.server.metrics())
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        routes = {"/text": ("text", "texts"), "/audio": ("audio", "paths")}
+        if self.path not in routes:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        name, many = routes[self.path]
+        batcher = self.server.batchers.get(name)
+        if batcher is None:
+            self._send(404, {"error": f"{name} analysis is not enabled"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("body must be a JSON object")
+            single = many not in payload
+            if single:
+                items = [payload["text" if name == "text" else "path"]]
+            else:
+                items = payload[many]
+            if not isinstance(items, list) or not all(
+                isinstance(item, str) for item in items
+            ):
+                raise ValueError(f"'{many}' must be a list of strings")
+        except (KeyError, ValueError) as e:
+            self._send(400, {"error": f"Invalid request: {e}"})
+            return
+        if len(items) > batcher.capacity:
+            self._send(
+                413,
+                {
+                    "error": f"Request has {len(items)} {many}, but the {name} queue "
+                    f"holds at most {batcher.capacity}; split it into smaller requests"
+                },
+            )
+            return
+
+        futures = []
+        try:
+            for item in items:
+                futures.append(batcher.submit(item))
+        except QueueFull as e:
+            for future in futures:
+                future.cancel()
+            self._send(503, {"error": str(e)}, {"Retry-After": "1"})
+            return
+
+        try:
+            results = [f.result(timeout=self.server.request_timeout) for f in futures]
+        except TimeoutError:
+            self._send(504, {"error": "Timed out waiting for analysis"})
+            return
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+            return
+
+        self._send(200, results[0] if single else {"results": results})
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None):
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+def build_server(
+    config: dict,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    max_batch_size: int = 32,
+    max_wait_ms: float = 10.0,
+    max_queue: int = 256,
+    request_timeout: float = 60.0,
+) -> AnalysisServer:
+    text_pipeline, voice_pipeline = build_pipelines(config, cache=open_cache(config))
+
+    inference = threading.Lock()
+    batchers = {
+        "text": MicroBatcher(
+            "text",
+            text_pipeline.analyze_many,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            max_queue=max_queue,
+            lock=inference,
+        )
+    }
+    if voice_pipeline is not None:
+        batchers["audio"] = MicroBatcher(
+            "audio",
+            voice_pipeline.analyze_paths,
+            max_batch_size=max(1, max_batch_size // 4),
+            max_wait_ms=max_wait_ms,
+            max_queue=max_queue,
+            lock=inference,
+        )
+    return AnalysisServer((host, port), batchers, request_timeout=request_timeout)
+
+
+def serve(config: dict, **kwargs):
+    server = build_server(config, **kwargs)
+    host, port = server.server_address[:2]
+    logging.info(
+        f"Serving {', '.join(server.batchers)} analysis on http://{host}:{port}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down")
+    finally:
+        server.server_close()
+        for batcher in server.batchers.values():
+            batcher.close()
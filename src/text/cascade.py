@@ -0,0 +1,120 @@
+import re
+from collections import Counter
+from random import Random
+
+EMOTION_LEXICON = {
+    "joy": (
+        "happy", "glad", "love", "loved", "loving", "enjoy", "enjoyed", "great",
+        "awesome", "wonderful", "fantastic", "excellent", "amazing", "fun", "excited",
+        "delighted", "pleased", "perfect", "beautiful", "best",
+    ),
+    "sadness": (
+        "sad", "unhappy", "depressed", "miserable", "cry", "cried", "crying", "lonely",
+        "disappointed", "disappointing", "heartbroken", "sorry", "miss", "lost",
+    ),
+    "anger": (
+        "angry", "furious", "mad", "hate", "hated", "annoyed", "annoying", "rage",
+        "outraged", "irritated", "frustrated", "frustrating", "ridiculous",
+    ),
+    "fear": (
+        "afraid", "scared", "terrified", "fear", "worried", "anxious", "nervous",
+        "frightened", "panic", "scary",
+    ),
+    "disgust": (
+        "disgusting", "disgusted", "gross", "nasty", "revolting", "awful", "horrible",
+        "vile", "sick", "terrible",
+    ),
+    "surprise": (
+        "surprised", "surprising", "wow", "unexpected", "shocked", "astonished",
+        "unbelievable", "suddenly",
+    ),
+}
+_WORDS = {word: label for label, words in EMOTION_LEXICON.items() for word in words}
+_TOKEN = re.compile(r"[a-z']+")
+
+
+class LexiconEmotionStage:
+    def __init__(self, pad_mapping: dict):
+        self.pad_mapping = pad_mapping
+
+    def predict(self, text: str, features: dict) -> tuple[str, float]:
+        polarity = features["polarity"]
+        hits = Counter(
+            _WORDS[token] for token in _TOKEN.findall(text.lower()) if token in _WORDS
+        )
+
+        if not hits:
+            if abs(polarity) <= 0.1 and not features["negation"]:
+                return "neutral", 1.0 - features["subjectivity"] - abs(polarity)
+            if polarity > 0:
+                return "joy", polarity * (0.5 if features["negation"] else 1.0)
+            return "sadness", abs(polarity) * 0.5
+
+        label, count = hits.most_common(1)[0]
+        confidence = count / sum(hits.values()) * min(1.0, 0.5 + abs(polarity))
+        if features["negation"]:
+            confidence *= 0.5
+        valence = self.pad_mapping[label]["valence"]
+        if (valence == "positive" and polarity < 0) or (
+            valence == "negative" and polarity > 0
+        ):
+            confidence *= 0.6
+        return label, confidence
+
+
+class EmotionCascade:
+    def __init__(
+        self,
+        model,
+        threshold: float = 0.8,
+        audit_rate: float = 0.05,
+        seed: int | None = 0,
+    ):
+        self.model = model
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.lexicon = LexiconEmotionStage(model.pad_mapping)
+        self.resolved = 0
+        self.escalated = 0
+        self.audited = 0
+        self.agreed = 0
+        self._rng = Random(seed)
+
+    def predict_many(
+        self, texts: list[str], features: list[dict], batch_size: int = 32
+    ) -> list[dict]:
+        cheap = [self.lexicon.predict(text, f) for text, f in zip(texts, features)]
+        escalate = [
+            i for i, (_, confidence) in enumerate(cheap) if confidence < self.threshold
+        ]
+        audit = [
+            i
+            for i, (_, confidence) in enumerate(cheap)
+            if confidence >= self.threshold and self._rng.random() < self.audit_rate
+        ]
+
+        predicted = self.model.predict_many(
+            [texts[i] for i in escalate + audit], batch_size=batch_size
+        )
+        results = [self._dimensions(label, confidence) for label, confidence in cheap]
+        for i, emotion in zip(escalate, predicted):
+            results[i] = {**emotion, "source": "model"}
+        for i, emotion in zip(audit, predicted[len(escalate) :]):
+            self.agreed += emotion["label"] == cheap[i][0]
+
+        self.escalated += len(escalate)
+        self.resolved += len(texts) - len(escalate)
+        self.audited += len(audit)
+        return results
+
+    def _dimensions(self, label: str, confidence: float) -> dict:
+        dimensions = self.model.pad_mapping.get(
+            label, {"valence": "neutral", "arousal": "neutral"}
+        )
+        return {
+            "label": label,
+            "valence": dimensions["valence"],
+            "arousal": dimensions["arousal"],
+            "source": "lexicon",
+            "confidence": round(confidence, 3),
+        }
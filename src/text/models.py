@@ -1,32 +1,53 @@
+import itertools
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import resources
+
 import language_tool_python
 import spacy
-from textblob import TextBlob
-from transformers import pipeline
+from textblob.sentiments import PatternAnalyzer
+
+from utils.backends import load_pipeline
 
 
 class TextEmotionModel:
-    def __init__(self, device):
-        self.classifier = pipeline(
+    MODEL_ID = "j-hartmann/emotion-english-distilroberta-base"
+    pad_mapping = {
+        "joy": {"valence": "positive", "arousal": "high"},
+        "surprise": {"valence": "positive", "arousal": "high"},
+        "anger": {"valence": "negative", "arousal": "high"},
+        "fear": {"valence": "negative", "arousal": "high"},
+        "disgust": {"valence": "negative", "arousal": "low"},
+        "sadness": {"valence": "negative", "arousal": "low"},
+        "neutral": {"valence": "neutral", "arousal": "neutral"},
+    }
+
+    def __init__(self, device, backend: str = "torch"):
+        self.backend = backend
+        self.classifier = load_pipeline(
             "text-classification",
-            model="j-hartmann/emotion-english-distilroberta-base",
-            device=device,
+            self.MODEL_ID,
+            device,
+            backend,
             truncation=True,
             max_length=512,
         )
-        self.pad_mapping = {
-            "joy": {"valence": "positive", "arousal": "high"},
-            "surprise": {"valence": "positive", "arousal": "high"},
-            "anger": {"valence": "negative", "arousal": "high"},
-            "fear": {"valence": "negative", "arousal": "high"},
-            "disgust": {"valence": "negative", "arousal": "low"},
-            "sadness": {"valence": "negative", "arousal": "low"},
-            "neutral": {"valence": "neutral", "arousal": "neutral"},
-        }
 
     def predict(self, text):
         result = self.classifier(text, truncation=True, max_length=512)
-        label = result[0]["label"]
+        return self._dimensions(result[0]["label"])
 
+    def predict_many(self, texts: list[str], batch_size: int = 32) -> list[dict]:
+        if not texts:
+            return []
+        results = self.classifier(
+            texts, batch_size=batch_size, truncation=True, max_length=512
+        )
+        return [self._dimensions(result["label"]) for result in results]
+
+    def _dimensions(self, label: str) -> dict:
         dimensions = self.pad_mapping.get(
             label, {"valence": "neutral", "arousal": "neutral"}
         )
@@ -38,64 +59,155 @@ class TextEmotionModel:
         }
 
 
+CORRECTION_MODES = ("full", "precheck", "off")
+_WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
+_SUSPICIOUS = re.compile(r"\s[,.!?;:]|([,.!?;:])\1|\b(\w+) \2\b|\bi\b|\s{2,}")
+
+
+@lru_cache(maxsize=1)
+def _lexicon() -> frozenset:
+    dictionary = resources.files("symspellpy") / "frequency_dictionary_en_82_765.txt"
+    with dictionary.open("r", encoding="utf-8") as f:
+        return frozenset(line.split(" ", 1)[0] for line in f)
+
+
+def looks_clean(text: str) -> bool:
+    if not text or not (text[0].isupper() or text[0].isdigit()):
+        return False
+    if text[-1] not in ".!?\"')" or _SUSPICIOUS.search(text):
+        return False
+    lexicon = _lexicon()
+    for word in _WORD.findall(text):
+        word = word.lower()
+        if word not in lexicon and word.split("'", 1)[0] not in lexicon:
+            return False
+    return True
+
+
 class TextCorrector:
-    def __init__(self, language: str = "en-US"):
-        self.tool = language_tool_python.LanguageTool(language)
+    def __init__(
+        self,
+        language: str = "en-US",
+        mode: str = "full",
+        servers: int = 1,
+        max_in_flight: int = 1,
+    ):
+        if mode not in CORRECTION_MODES:
+            raise ValueError(
+                f"Unknown correction mode '{mode}', expected one of {CORRECTION_MODES}"
+            )
+        self.language = language
+        self.mode = mode
+        self.tools = []
+        if mode != "off":
+            self.tools = [
+                language_tool_python.LanguageTool(language) for _ in range(max(servers, 1))
+            ]
+        self.tool = self.tools[0] if self.tools else None
+        self.checked = 0
+        self.skipped = 0
+        self._next_tool = itertools.count()
+        self._lock = threading.Lock()
+        self._executor = None
+        if self.tools and max_in_flight > 1:
+            self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
 
     def correct(self, text: str) -> str:
-        matches = self.tool.check(text)
+        if self.mode == "off" or (self.mode == "precheck" and looks_clean(text)):
+            with self._lock:
+                self.skipped += 1
+            return text
+
+        tool = self.tools[next(self._next_tool) % len(self.tools)]
+        matches = tool.check(text)
         corrected_text = language_tool_python.utils.correct(text, matches)
+        with self._lock:
+            self.checked += 1
         return corrected_text
 
+    def correct_many(self, texts: list[str]) -> list[str]:
+        unique = list(dict.fromkeys(texts))
+        if self._executor is None:
+            corrected = {text: self.correct(text) for text in unique}
+        else:
+            corrected = dict(zip(unique, self._executor.map(self.correct, unique)))
+        return [corrected[text] for text in texts]
 
-class StatementTypeAnalyzer:
-    def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            from spacy.cli import download
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+        for tool in self.tools:
+            tool.close()
 
-            download("en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
 
-    def analyze(self, text: str, subjectivity: float) -> list[str]:
-        doc = self.nlp(text)
-        types = set()
+FIRST_PERSON = frozenset({"i", "me", "my", "mine", "we", "us", "our"})
 
-        has_negation = any(token.dep_ == "neg" for token in doc)
-        types.add("negation" if has_negation else "affirmation")
 
-        first_person = {"i", "me", "my", "mine", "we", "us", "our"}
-        has_personal_pronouns = any(token.text.lower() in first_person for token in doc)
+def load_spacy(model_id: str, disable: tuple = ()):
+    try:
+        return spacy.load(model_id, disable=list(disable))
+    except OSError:
+        from spacy.cli import download
 
-        if has_personal_pronouns or subjectivity > 0.5:
-            types.add("personal")
-        else:
-            types.add("factual")
+        download(model_id)
+        return spacy.load(model_id, disable=list(disable))
 
-        return list(types)
 
+class LinguisticFeatureExtractor:
+    MODEL_ID = "en_core_web_sm"
+    DISABLED = ("tagger", "attribute_ruler", "lemmatizer", "ner")
 
-class SentimentAnalyzer:
-    def analyze(
-        self,
-        text: str,
-        polarity_threshold: float = 0.2,
-        subjectivity_threshold: float = 0.5,
-    ) -> dict:
-        blob = TextBlob(text)
-        polarity = round(blob.sentiment.polarity, 3)
-        subjectivity = round(blob.sentiment.subjectivity, 3)
+    def __init__(self):
+        self.nlp = load_spacy(self.MODEL_ID, disable=self.DISABLED)
+        self.version = self.nlp.meta.get("version", "")
+        self.analyzer = PatternAnalyzer()
+
+    def extract(self, text: str) -> dict:
+        return self._features(text, self.nlp(text))
+
+    def extract_many(self, texts: list[str], batch_size: int = 32) -> list[dict]:
+        docs = self.nlp.pipe(texts, batch_size=batch_size)
+        return [self._features(text, doc) for text, doc in zip(texts, docs)]
 
+    def _features(self, text: str, doc) -> dict:
+        polarity, subjectivity = self.analyzer.analyze(text)
         return {
-            "polarity": polarity,
-            "subjectivity": subjectivity,
-            "polarity_label": (
-                "neutral"
-                if abs(polarity) <= polarity_threshold
-                else ("positive" if polarity > 0 else "negative")
-            ),
-            "subjectivity_label": "personal"
-            if subjectivity > subjectivity_threshold
-            else "factual",
+            "polarity": round(polarity, 3),
+            "subjectivity": round(subjectivity, 3),
+            "negation": any(token.dep_ == "neg" for token in doc),
+            "first_person": any(token.lower_ in FIRST_PERSON for token in doc),
         }
+
+
+def classify_statement(
+    negation: bool, first_person: bool, subjectivity: float
+) -> list[str]:
+    types = set()
+    types.add("negation" if negation else "affirmation")
+
+    if first_person or subjectivity > 0.5:
+        types.add("personal")
+    else:
+        types.add("factual")
+
+    return list(types)
+
+
+def describe_sentiment(
+    polarity: float,
+    subjectivity: float,
+    polarity_threshold: float = 0.2,
+    subjectivity_threshold: float = 0.5,
+) -> dict:
+    return {
+        "polarity": polarity,
+        "subjectivity": subjectivity,
+        "polarity_label": (
+            "neutral"
+            if abs(polarity) <= polarity_threshold
+            else ("positive" if polarity > 0 else "negative")
+        ),
+        "subjectivity_label": "personal"
+        if subjectivity > subjectivity_threshold
+        else "factual",
+    }
@@ -1,41 +1,228 @@
+import json
+from collections import defaultdict
+from importlib.metadata import version
+from typing import Iterable, Iterator
+
 import torch
 
 from data.preprocessing import truncate_text
+from utils.backends import check_backend
+from utils.cache import ResultCache
+from utils.profiler import PROFILER
+from utils.registry import shared
 from .models import (
     TextCorrector,
-    SentimentAnalyzer,
     TextEmotionModel,
-    StatementTypeAnalyzer,
+    LinguisticFeatureExtractor,
+    classify_statement,
+    describe_sentiment,
 )
 
+PIPELINE_VERSION = "1"
+
+
+def text_model_classes(backend: str) -> tuple:
+    check_backend(backend)
+    if backend == "stub":
+        from .stubs import (
+            StubLinguisticFeatureExtractor,
+            StubTextCorrector,
+            StubTextEmotionModel,
+        )
+
+        return StubTextCorrector, StubTextEmotionModel, StubLinguisticFeatureExtractor
+    return TextCorrector, TextEmotionModel, LinguisticFeatureExtractor
+
 
 class TextAnalysisPipeline:
-    def __init__(self, device: str | None = None):
+    def __init__(
+        self,
+        device: str | None = None,
+        batch_size: int = 32,
+        cache: ResultCache | None = None,
+        backend: str = "torch",
+        correction: str = "full",
+        correction_servers: int = 1,
+        correction_in_flight: int = 1,
+        cascade: bool = False,
+        cascade_threshold: float = 0.8,
+        cascade_audit: float = 0.05,
+    ):
         if device is None:
             device = "cuda" if torch.cuda.is_available() else "cpu"
 
-        self.corrector = TextCorrector()
-        self.sentiment = SentimentAnalyzer()
-        self.emotion = TextEmotionModel(device)
-        self.statement = StatementTypeAnalyzer()
+        corrector_cls, emotion_cls, features_cls = text_model_classes(backend)
+
+        self.batch_size = batch_size
+        self.cache = cache
+        self.corrector = shared(
+            corrector_cls,
+            mode=correction,
+            servers=correction_servers,
+            max_in_flight=correction_in_flight,
+        )
+        self.emotion = shared(emotion_cls, device, backend=backend)
+        self.features = shared(features_cls)
+        self.cascade = None
+        if cascade:
+            from .cascade import EmotionCascade
+
+            self.cascade = EmotionCascade(
+                self.emotion, threshold=cascade_threshold, audit_rate=cascade_audit
+            )
+        namespace = {
+            "pipeline": PIPELINE_VERSION,
+            "corrector": [self.corrector.language, self.corrector.mode],
+            "sentiment": version("textblob"),
+            "emotion": [self.emotion.MODEL_ID, backend],
+            "features": [self.features.MODEL_ID, self.features.version],
+        }
+        if cascade:
+            namespace["cascade"] = cascade_threshold
+        self.cache_namespace = json.dumps(namespace, sort_keys=True)
 
     def analyze(self, text: str) -> dict:
         text = truncate_text(text)
 
-        corrected = self.corrector.correct(text)
-        sentiment_result = self.sentiment.analyze(corrected)
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(text, self.cache_namespace)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return {**cached, "original_text": text}
+
+        with PROFILER.stage("text.correct"):
+            corrected = self.corrector.correct(text)
+        with PROFILER.stage("text.features"):
+            features = self.features.extract(corrected)
+        with PROFILER.stage("text.emotion"):
+            emotion = self._predict_emotions([corrected], [features])[0]
+
+        result = self._build_result(text, corrected, features, emotion)
+        if key is not None:
+            self.cache.put(key, result)
+            self.cache.commit()
+        return result
+
+    def analyze_many(self, texts: list[str]) -> list[dict]:
+        return list(self.analyze_iter(texts))
+
+    def analyze_iter(self, texts: Iterable[str]) -> Iterator[dict]:
+        batch = []
+        for text in texts:
+            batch.append(truncate_text(text))
+            if len(batch) >= self.batch_size:
+                yield from self._analyze_step(batch)
+                batch = []
+        if batch:
+            yield from self._analyze_step(batch)
 
+    def _analyze_step(self, texts: list[str]) -> list[dict]:
+        if self.cache is None:
+            return self._analyze_batch(texts)
+        return self._analyze_cached_batch(texts)
+
+    def _analyze_cached_batch(self, texts: list[str]) -> list[dict]:
+        keys = [self.cache.key(text, self.cache_namespace) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+
+        pending = {}
+        for i, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            computed = self._analyze_batch([texts[indices[0]] for indices in pending.values()])
+            for (key, indices), result in zip(pending.items(), computed):
+                self.cache.put(key, result)
+                for i in indices:
+                    results[i] = result
+            self.cache.commit()
+
+        return [
+            {**result, "original_text": text} for text, result in zip(texts, results)
+        ]
+
+    def _analyze_batch(self, texts: list[str]) -> list[dict]:
+        items = len(texts)
+        with PROFILER.stage("text.correct", items):
+            corrected = self.corrector.correct_many(texts)
+        with PROFILER.stage("text.features", items):
+            features = self.features.extract_many(corrected, batch_size=self.batch_size)
+        with PROFILER.stage("text.emotion", items):
+            emotions = self._predict_emotions(corrected, features)
+
+        return [
+            self._build_result(*fields)
+            for fields in zip(texts, corrected, features, emotions)
+        ]
+
+    def _predict_emotions(self, texts: list[str], features: list[dict]) -> list[dict]:
+        if self.cascade is None:
+            return self.emotion.predict_many(texts, batch_size=self.batch_size)
+        return self.cascade.predict_many(texts, features, batch_size=self.batch_size)
+
+    def _build_result(
+        self,
+        text: str,
+        corrected: str,
+        features: dict,
+        emotion: dict,
+    ) -> dict:
         return {
             "original_text": text,
             "corrected_text": corrected,
             "analysis": {
-                **sentiment_result,
-                "emotion": self.emotion.predict(corrected),
-                "statement_type": self.statement.analyze(
-                    corrected, sentiment_result["subjectivity"]
+                **describe_sentiment(features["polarity"], features["subjectivity"]),
+                "emotion": emotion,
+                "statement_type": classify_statement(
+                    features["negation"],
+                    features["first_person"],
+                    features["subjectivity"],
                 ),
             },
         }
 
-    def analyze_many(self, texts: list[str]) -> list[dict]:
-        return [self.analyze(text) for text in texts]
+
+def combine_results(results: list[dict], weights: list[float]) -> dict:
+    if not any(weights):
+        weights = [1.0] * len(results)
+    total = sum(weights) or 1.0
+
+    polarity = subjectivity = 0.0
+    negation = first_person = False
+    emotions = defaultdict(float)
+    dimensions = {}
+    for result, weight in zip(results, weights):
+        analysis = result["analysis"]
+        polarity += analysis["polarity"] * weight / total
+        subjectivity += analysis["subjectivity"] * weight / total
+        negation |= "negation" in analysis["statement_type"]
+        first_person |= (
+            "personal" in analysis["statement_type"] and analysis["subjectivity"] <= 0.5
+        )
+        emotions[analysis["emotion"]["label"]] += weight
+        dimensions.setdefault(analysis["emotion"]["label"], analysis["emotion"])
+
+    label = max(emotions, key=emotions.get) if emotions else "neutral"
+    emotion = dimensions.get(label, {"valence": "neutral", "arousal": "neutral"})
+    return {
+        "original_text": " ".join(
+            result["original_text"] for result in results if result["original_text"]
+        ),
+        "corrected_text": " ".join(
+            result["corrected_text"] for result in results if result["corrected_text"]
+        ),
+        "analysis": {
+            **describe_sentiment(round(polarity, 3), round(subjectivity, 3)),
+            "emotion": {
+                "label": label,
+                "valence": emotion["valence"],
+                "arousal": emotion["arousal"],
+                "share": emotions[label] / total if emotions else 0.0,
+            },
+            "statement_type": classify_statement(
+                negation, first_person, subjectivity
+            ),
+        },
+    }
@@ -0,0 +1,74 @@
+import hashlib
+
+from textblob.sentiments import PatternAnalyzer
+
+from .models import FIRST_PERSON, LinguisticFeatureExtractor, TextEmotionModel
+
+EMOTION_LABELS = ("anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise")
+
+
+def _stable_hash(text: str) -> int:
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class StubTextCorrector:
+    def __init__(
+        self,
+        language: str = "en-US",
+        mode: str = "full",
+        servers: int = 1,
+        max_in_flight: int = 1,
+    ):
+        self.language = f"stub-{language}"
+        self.mode = mode
+        self.checked = 0
+        self.skipped = 0
+
+    def correct(self, text: str) -> str:
+        if self.mode == "off":
+            self.skipped += 1
+            return text
+        self.checked += 1
+        return " ".join(text.split())
+
+    def correct_many(self, texts: list[str]) -> list[str]:
+        return [self.correct(text) for text in texts]
+
+
+class StubTextEmotionModel(TextEmotionModel):
+    MODEL_ID = "stub"
+
+    def __init__(self, device: str | None = None, backend: str = "stub"):
+        self.backend = backend
+
+    def predict(self, text):
+        label = EMOTION_LABELS[_stable_hash(text) % len(EMOTION_LABELS)]
+        return self._dimensions(label)
+
+    def predict_many(self, texts: list[str], batch_size: int = 32) -> list[dict]:
+        return [self.predict(text) for text in texts]
+
+
+class StubLinguisticFeatureExtractor(LinguisticFeatureExtractor):
+    MODEL_ID = "stub"
+
+    def __init__(self):
+        self.version = "0"
+        self.analyzer = PatternAnalyzer()
+
+    def extract(self, text: str) -> dict:
+        tokens = [token.strip(".,!?;:'\"()").lower() for token in text.split()]
+        polarity, subjectivity = self.analyzer.analyze(text)
+        return {
+            "polarity": round(polarity, 3),
+            "subjectivity": round(subjectivity, 3),
+            "negation": any(
+                token in {"not", "no", "never"} or token.endswith("n't")
+                for token in tokens
+            ),
+            "first_person": any(token in FIRST_PERSON for token in tokens),
+        }
+
+    def extract_many(self, texts: list[str], batch_size: int = 32) -> list[dict]:
+        return [self.extract(text) for text in texts]
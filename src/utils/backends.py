@@ -0,0 +1,68 @@
+import logging
+import os
+
+from utils.cache import CACHE_DIR
+
+BACKENDS = ("torch", "quantized", "onnx", "stub")
+ONNX_DIR = os.path.join(CACHE_DIR, "onnx")
+
+_ORT_MODELS = {
+    "text-classification": "ORTModelForSequenceClassification",
+    "audio-classification": "ORTModelForAudioClassification",
+    "automatic-speech-recognition": "ORTModelForSpeechSeq2Seq",
+}
+
+
+def check_backend(backend: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+
+def load_pipeline(task: str, model_id: str, device, backend: str = "torch", **kwargs):
+    from transformers import pipeline
+
+    check_backend(backend)
+    if backend == "onnx":
+        return _onnx_pipeline(task, model_id, **kwargs)
+
+    if backend == "quantized" and str(device) != "cpu":
+        logging.warning(
+            f"Dynamic int8 quantization only runs on CPU, loading {model_id} on cpu"
+        )
+        device = "cpu"
+
+    hf_pipeline = pipeline(task, model=model_id, device=device, **kwargs)
+    if backend == "quantized":
+        import torch
+
+        hf_pipeline.model = torch.ao.quantization.quantize_dynamic(
+            hf_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return hf_pipeline
+
+
+def _onnx_pipeline(task: str, model_id: str, **kwargs):
+    try:
+        import optimum.onnxruntime as ort
+    except ImportError as e:
+        raise ImportError(
+            "The 'onnx' backend requires optimum with ONNX Runtime: "
+            "pip install 'optimum[onnxruntime]'"
+        ) from e
+    from transformers import AutoFeatureExtractor, AutoTokenizer, pipeline
+
+    model_cls = getattr(ort, _ORT_MODELS[task])
+    export_dir = os.path.join(ONNX_DIR, model_id.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        model = model_cls.from_pretrained(export_dir)
+    else:
+        logging.info(f"Exporting {model_id} to ONNX in {export_dir}")
+        model = model_cls.from_pretrained(model_id, export=True)
+        model.save_pretrained(export_dir)
+
+    components = {}
+    if task != "audio-classification":
+        components["tokenizer"] = AutoTokenizer.from_pretrained(model_id)
+    if task != "text-classification":
+        components["feature_extractor"] = AutoFeatureExtractor.from_pretrained(model_id)
+    return pipeline(task, model=model, **components, **kwargs)
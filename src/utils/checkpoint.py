@@ -0,0 +1,108 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+from typing import Callable, Iterable, Iterator
+
+CHECKPOINT_DIR = "checkpoints"
+VOLATILE_KEYS = ("workers", "resume", "checkpoint")
+
+
+def run_id(config: dict) -> str:
+    stable = {key: value for key, value in config.items() if key not in VOLATILE_KEYS}
+    payload = json.dumps(stable, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def item_key(item) -> str:
+    if isinstance(item, dict):
+        return f"{item['set_id']}:{'|'.join(item.get('files') or [])}"
+    return hashlib.sha256(item.encode("utf-8")).hexdigest()
+
+
+def item_results(item) -> int:
+    if isinstance(item, dict):
+        return len(item.get("files") or [])
+    return 1
+
+
+class Checkpoint:
+    def __init__(self, config: dict, directory: str = CHECKPOINT_DIR):
+        self.run_id = run_id(config)
+        self.path = os.path.join(directory, self.run_id)
+        self.config = config
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._file("run.json"))
+
+    def start(self, filepath: str, items: list):
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.makedirs(self.path)
+        with open(self._file("items.json"), "w", encoding="utf-8") as f:
+            json.dump(items, f)
+        open(self._file("results.jsonl"), "w").close()
+        with open(self._file("run.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {"filepath": filepath, "config": self.config}, f, indent=4, default=str
+            )
+        logging.info(f"Checkpointing run {self.run_id} to {self.path}")
+
+    def restore(self) -> tuple[str, list]:
+        with open(self._file("run.json"), "r", encoding="utf-8") as f:
+            filepath = json.load(f)["filepath"]
+        with open(self._file("items.json"), "r", encoding="utf-8") as f:
+            items = json.load(f)
+        return filepath, items
+
+    def completed(self) -> dict[str, list[dict]]:
+        done = {}
+        path = self._file("results.jsonl")
+        if not os.path.exists(path):
+            return done
+
+        valid = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                done[record["key"]] = record["results"]
+                valid += len(line)
+        if valid < os.path.getsize(path):
+            os.truncate(path, valid)
+        return done
+
+    def analyze(
+        self, items: list, analyze: Callable[[list], Iterable[dict]]
+    ) -> Iterator[dict]:
+        done = self.completed()
+        pending = [item for item in items if item_key(item) not in done]
+        if done:
+            logging.info(
+                f"Resuming run {self.run_id}: {len(items) - len(pending)} of "
+                f"{len(items)} items already done"
+            )
+
+        fresh = iter(analyze(pending)) if pending else iter(())
+        with open(self._file("results.jsonl"), "a", encoding="utf-8") as f:
+            for item in items:
+                key = item_key(item)
+                if key in done:
+                    yield from done[key]
+                    continue
+                results = list(itertools.islice(fresh, item_results(item)))
+                f.write(json.dumps({"key": key, "results": results}) + "\n")
+                f.flush()
+                yield from results
+
+    def complete(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        logging.info(f"Run {self.run_id} complete, checkpoint removed")
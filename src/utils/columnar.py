@@ -0,0 +1,167 @@
+import logging
+import os
+from typing import Iterable
+
+import pandas as pd
+import tabulate
+
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+COLUMNAR_EXTENSIONS = tuple(COLUMNAR_FORMATS.values())
+LABEL_COLUMNS = (
+    "polarity_label",
+    "subjectivity_label",
+    "emotion",
+    "valence",
+    "arousal",
+    "voice_emotion",
+    "voice_valence",
+    "voice_arousal",
+)
+GROUP_COLUMNS = ("gender", "country")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Columnar results require pyarrow: pip install pyarrow"
+        ) from e
+
+
+def _text_columns(text_result: dict) -> dict:
+    analysis = text_result["analysis"]
+    emotion = analysis["emotion"]
+    return {
+        "original_text": text_result["original_text"],
+        "corrected_text": text_result["corrected_text"],
+        "polarity": analysis["polarity"],
+        "subjectivity": analysis["subjectivity"],
+        "polarity_label": analysis["polarity_label"],
+        "subjectivity_label": analysis["subjectivity_label"],
+        "emotion": emotion["label"],
+        "valence": emotion["valence"],
+        "arousal": emotion["arousal"],
+        "statement_type": ", ".join(sorted(analysis["statement_type"])),
+    }
+
+
+def flatten_result(result: dict) -> dict:
+    if "audio_path" not in result:
+        return _text_columns(result)
+
+    metadata = result.get("metadata", {})
+    voice_emotion = result["voice_emotion"]
+    return {
+        "id": result.get("id"),
+        "audio_path": result["audio_path"],
+        "transcription": result["transcription"],
+        "voice_emotion": voice_emotion["label"],
+        "voice_valence": voice_emotion["valence"],
+        "voice_arousal": voice_emotion["arousal"],
+        **_text_columns(result["text_analysis"]),
+        "gender": metadata.get("gender"),
+        "age": metadata.get("age"),
+        "country": metadata.get("country"),
+    }
+
+
+def results_frame(results: Iterable[dict]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(flatten_result(result) for result in results)
+    for column in (*LABEL_COLUMNS, *GROUP_COLUMNS, "statement_type"):
+        if column in frame:
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def columnar_path(filepath: str, fmt: str) -> str:
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(
+            f"Unknown columnar format '{fmt}', expected one of {tuple(COLUMNAR_FORMATS)}"
+        )
+    return os.path.splitext(filepath)[0] + COLUMNAR_FORMATS[fmt]
+
+
+def save_columnar(results: Iterable[dict], filepath: str, fmt: str = "parquet") -> str:
+    _require_pyarrow()
+    path = columnar_path(filepath, fmt)
+    frame = results_frame(results)
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_feather(path)
+    logging.info(f"{len(frame)} rows saved to {path}")
+    return path
+
+
+def load_frame(path: str) -> pd.DataFrame:
+    if path.lower().endswith(".parquet"):
+        _require_pyarrow()
+        return pd.read_parquet(path)
+    if path.lower().endswith(".arrow"):
+        _require_pyarrow()
+        return pd.read_feather(path)
+
+    from utils.file import load_json_file
+
+    return results_frame(load_json_file(path))
+
+
+def summarize(frame: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    summary = {}
+    if frame.empty:
+        return summary
+
+    numeric = [c for c in ("polarity", "subjectivity") if c in frame]
+    summary["scores"] = frame[numeric].describe().T
+
+    for column in LABEL_COLUMNS:
+        if column in frame:
+            counts = frame[column].value_counts()
+            summary[column] = pd.DataFrame(
+                {"count": counts, "share": counts / len(frame)}
+            )
+
+    statement_types = frame["statement_type"].astype(str).str.get_dummies(sep=", ")
+    summary["statement_type"] = statement_types.sum().to_frame("count")
+
+    if "voice_emotion" in frame:
+        summary["voice_emotion x emotion"] = pd.crosstab(
+            frame["voice_emotion"], frame["emotion"]
+        )
+        for column in GROUP_COLUMNS:
+            if frame[column].notna().any():
+                summary[f"{column} x voice_emotion"] = pd.crosstab(
+                    frame[column], frame["voice_emotion"]
+                )
+                summary[f"{column} x emotion"] = pd.crosstab(
+                    frame[column], frame["emotion"]
+                )
+                summary[f"{column} agreement"] = (
+                    (frame["voice_emotion"].astype(str) == frame["emotion"].astype(str))
+                    .groupby(frame[column], observed=True)
+                    .mean()
+                    .to_frame("voice_text_agreement")
+                )
+    else:
+        summary["emotion x statement_type"] = pd.crosstab(
+            frame["emotion"], frame["statement_type"]
+        )
+
+    return summary
+
+
+def log_summary(name: str, frame: pd.DataFrame):
+    summary = summarize(frame)
+    if not summary:
+        print(f"{name}: no results to summarize.")
+        return
+
+    print(f"\n{name}: {len(frame)} rows")
+    for title, table in summary.items():
+        print(f"\n{title}")
+        print(
+            tabulate.tabulate(
+                table, headers="keys", tablefmt="grid", floatfmt=".3f"
+            )
+        )
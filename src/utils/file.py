@@ -2,40 +2,68 @@ import json
 import logging
 import os
 import time
-from typing import Any, List, Dict
-
-from voice.pipeline import save_spectrogram
+from typing import Any, Dict, Iterable, Iterator, List
 
 RESULTS_DIR = "results"
+JSON_EXTENSIONS = (".json",)
+RESULTS_EXTENSIONS = (".json", ".jsonl")
 
 
-def save_results(results: List[dict], filename: str):
+def results_path(filename: str) -> str:
     os.makedirs(RESULTS_DIR, exist_ok=True)
-    filepath = os.path.join(
-        RESULTS_DIR, f"{filename}_{str(int(time.time() * 1000))}.json"
-    )
+    return os.path.join(RESULTS_DIR, f"{filename}_{str(int(time.time() * 1000))}.jsonl")
+
+
+class ResultsWriter:
+    def __init__(self, filepath: str, flush_every: int = 50):
+        self.filepath = filepath
+        self.flush_every = flush_every
+        self.count = 0
+        self._file = open(filepath, "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, result: dict):
+        self._file.write(json.dumps(result, separators=(",", ":")) + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def write_many(self, results: Iterable[dict]):
+        for result in results:
+            self.write(result)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        logging.info(f"{self.count} results saved to {self.filepath}")
+
+
+def save_columnar_results(filepath: str, fmt: str):
+    from utils.columnar import save_columnar
+
     try:
-        with open(filepath, "w") as f:
-            json.dump(results, f, indent=4)
-        logging.info(f"All results saved to {filepath}")
+        save_columnar(iter_results(filepath), filepath, fmt)
     except Exception as e:
-        logging.error(f"Failed to save all results to {filepath}: {e}")
+        logging.error(f"Failed to save {fmt} results for {filepath}: {e}")
+
 
-    if any("audio_path" in r for r in results):
-        for r in results:
-            if "audio_path" in r:
-                audio_path = r["audio_path"]
-                id = r.get("id", time.time() * 1000)
-                output_path = os.path.join(
-                    filepath.rsplit(".", 1)[0],
-                    f"{id}_{os.path.basename(audio_path).rsplit('.', 1)[0]}.png",
-                )
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                save_spectrogram(audio_path, output_path=output_path)
+def iter_results(path: str) -> Iterator[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
 
 
 def load_json_file(path: str) -> List[Any]:
     try:
+        if path.lower().endswith(".jsonl"):
+            return list(iter_results(path))
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except json.JSONDecodeError as e:
@@ -49,19 +77,21 @@ def load_json_file(path: str) -> List[Any]:
         raise ValueError(f"File '{path}' does not contain a JSON object or list.")
 
 
-def find_files(input_paths: List[str]) -> List[List[str]]:
+def find_files(
+    input_paths: List[str], extensions: tuple = JSON_EXTENSIONS
+) -> List[List[str]]:
     found = []
     for p in input_paths:
         if not os.path.exists(p):
             raise FileNotFoundError(f"Path not found: {p}")
         if os.path.isfile(p):
-            if p.lower().endswith(".json"):
+            if p.lower().endswith(extensions):
                 found.append([p])
             continue
         pfound = []
         for root, _, files in os.walk(p):
             for f in files:
-                if f.lower().endswith(".json"):
+                if f.lower().endswith(extensions):
                     pfound.append(os.path.join(root, f))
         if not pfound:
             raise FileNotFoundError(f"No JSON files found in directory: {p}")
@@ -69,8 +99,10 @@ def find_files(input_paths: List[str]) -> List[List[str]]:
     return found
 
 
-def load_jsons(paths: List[str]) -> Dict[str, List[Any]]:
-    file_groups = find_files(paths)
+def load_jsons(
+    paths: List[str], extensions: tuple = JSON_EXTENSIONS
+) -> Dict[str, List[Any]]:
+    file_groups = find_files(paths, extensions)
     file_map = {}
     for group in file_groups:
         for filepath in group:
@@ -0,0 +1,81 @@
+import logging
+import os
+import sys
+import time
+from importlib.machinery import ExtensionFileLoader, SourceFileLoader
+
+import tabulate
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportTimer:
+    def __init__(self, root: str = PROJECT_ROOT, started: float | None = None):
+        self.root = root
+        self.started = time.perf_counter() if started is None else started
+        self.timings = {}
+        self._stack = []
+
+    def install(self) -> "ImportTimer":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if isinstance(spec.loader, (SourceFileLoader, ExtensionFileLoader)):
+                self._wrap(spec.loader, fullname, spec.origin or "")
+            return spec
+        return None
+
+    def _wrap(self, loader, fullname: str, origin: str):
+        exec_module = loader.exec_module
+        project = os.path.abspath(origin).startswith(self.root + os.sep)
+
+        def timed_exec_module(module):
+            parent = self._stack[-1] if self._stack else None
+            self._stack.append([fullname, 0.0, project])
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                _, children, _ = self._stack.pop()
+                if parent is not None:
+                    parent[1] += elapsed
+                if project or (parent is not None and parent[2]):
+                    self.timings[fullname] = (elapsed, elapsed - children, project)
+
+        loader.exec_module = timed_exec_module
+
+    def report(self, limit: int = 20):
+        self.uninstall()
+        rows = sorted(self.timings.items(), key=lambda item: item[1][0], reverse=True)
+        table = [
+            [
+                name,
+                "project" if project else "dependency",
+                f"{cumulative * 1000:.1f}",
+                f"{own * 1000:.1f}",
+            ]
+            for name, (cumulative, own, project) in rows[:limit]
+        ]
+        total = time.perf_counter() - self.started
+        logging.info(
+            f"Import timing: {len(self.timings)} modules, {total:.2f}s since startup"
+        )
+        print(
+            tabulate.tabulate(
+                table,
+                headers=["Module", "Kind", "Cumulative (ms)", "Self (ms)"],
+                tablefmt="grid",
+            )
+        )
@@ -3,7 +3,7 @@ import os
 import sys
 import time
 from pathlib import Path
-from typing import Tuple
+from typing import Iterable, Tuple
 
 import tabulate
 
@@ -48,7 +48,7 @@ def set_log_file(dataset: str, model: str) -> Tuple[logging.Logger, str]:
     return logger, logfile
 
 
-def log_text_results(results: list[dict], truncate: int = 30):
+def log_text_results(results: Iterable[dict], truncate: int = 30):
     table = []
 
     for result in results:
@@ -86,7 +86,7 @@ def log_text_results(results: list[dict], truncate: int = 30):
     print(tabulate.tabulate(table, headers=headers, tablefmt="grid"))
 
 
-def log_audio_results(results: list[dict], truncate: int = 30):
+def log_audio_results(results: Iterable[dict], truncate: int = 30):
     table = []
     for result in results:
         voice_emo = result["voice_emotion"]
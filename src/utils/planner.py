@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from utils.checkpoint import VOLATILE_KEYS, item_key, item_results
+
+SELECTION_KEYS = ("limit", "random", "seed")
+OUTPUT_KEYS = ("columnar",)
+
+
+def plan_runs(configs: list[dict]) -> list[list[dict]]:
+    groups = {}
+    for config in configs:
+        shared = {
+            key: value
+            for key, value in config.items()
+            if key not in (*SELECTION_KEYS, *OUTPUT_KEYS, *VOLATILE_KEYS)
+        }
+        groups.setdefault(json.dumps(shared, sort_keys=True, default=str), []).append(
+            config
+        )
+    return list(groups.values())
+
+
+def select_items(configs: list[dict]) -> list[list]:
+    from data.loader import AUDIO_ROOT, iter_csv_texts, load_audio_dataset
+
+    base = configs[0]
+    dataset = base.get("dataset", "")
+    mode = base.get("mode", "text")
+
+    if mode == "text":
+        return select_texts(iter_csv_texts(dataset, text_column="text"), configs)
+
+    if mode != "audio":
+        raise ValueError("Provide a valid mode: 'text' or 'audio'")
+
+    if not base.get("manifest", True):
+        return [
+            load_audio_dataset(
+                csv_path=dataset,
+                limit=config.get("limit"),
+                random=config.get("random", False),
+                seed=config.get("seed"),
+                manifest=False,
+            )
+            for config in configs
+        ]
+
+    from data.manifest import AudioManifest
+
+    with AudioManifest(dataset, AUDIO_ROOT) as index:
+        index.refresh(rescan=base.get("manifest_rescan", False))
+        return [
+            index.entries(
+                limit=config.get("limit"),
+                random=config.get("random", False),
+                seed=config.get("seed"),
+            )
+            for config in configs
+        ]
+
+
+def select_texts(texts: Iterable[str], configs: list[dict]) -> list[list[str]]:
+    from data.loader import TextReservoir
+
+    reservoirs = {
+        i: TextReservoir(config.get("limit"), config.get("seed"))
+        for i, config in enumerate(configs)
+        if config.get("random", False)
+    }
+    heads = {i: [] for i in range(len(configs)) if i not in reservoirs}
+    open_heads = set(heads)
+
+    for text in texts:
+        for reservoir in reservoirs.values():
+            reservoir.add(text)
+        for i in list(open_heads):
+            heads[i].append(text)
+            limit = configs[i].get("limit")
+            if limit and len(heads[i]) >= limit:
+                open_heads.discard(i)
+        if not reservoirs and not open_heads:
+            break
+
+    return [
+        reservoirs[i].sample() if i in reservoirs else heads[i]
+        for i in range(len(configs))
+    ]
+
+
+def union_items(selections: list[list]) -> list:
+    seen = set()
+    union = []
+    for items in selections:
+        for item in items:
+            key = item_key(item)
+            if key not in seen:
+                seen.add(key)
+                union.append(item)
+    return union
+
+
+def group_results(items: list, results: Iterable[dict]) -> Iterator[tuple[str, list]]:
+    results = iter(results)
+    for item in items:
+        yield item_key(item), [next(results) for _ in range(item_results(item))]
+
+
+class ResultStore:
+    def __init__(self):
+        self._dir = tempfile.mkdtemp(prefix="results_")
+        self._conn = sqlite3.connect(os.path.join(self._dir, "results.sqlite"))
+        self._conn.execute("CREATE TABLE results (key TEXT PRIMARY KEY, value TEXT)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def put_all(self, items: list, results: Iterable[dict]):
+        for key, grouped in group_results(items, results):
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?)",
+                (key, json.dumps(grouped, separators=(",", ":"))),
+            )
+        self._conn.commit()
+
+    def get(self, item) -> list[dict]:
+        row = self._conn.execute(
+            "SELECT value FROM results WHERE key = ?", (item_key(item),)
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else []
+
+    def close(self):
+        self._conn.close()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+def link_spectrograms(source_dir: str, target_dir: str, entries: list[dict]):
+    source = Path(source_dir)
+    if not source.is_dir():
+        return
+    os.makedirs(target_dir, exist_ok=True)
+    for entry in entries:
+        for path in entry.get("files") or []:
+            stem = f"{entry['set_id']}_{os.path.basename(path).rsplit('.', 1)[0]}"
+            matches = [*source.glob(f"{stem}.*"), *source.glob(f"{stem}_[0-9]*.*")]
+            for file in matches:
+                target = os.path.join(target_dir, file.name)
+                if os.path.exists(target):
+                    continue
+                try:
+                    os.link(file, target)
+                except OSError:
+                    shutil.copy2(file, target)
+    logging.debug(f"Linked spectrograms from {source_dir} into {target_dir}")
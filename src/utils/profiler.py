@@ -0,0 +1,156 @@
+import json
+import logging
+import threading
+import time
+
+import tabulate
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "items", "wall", "cpu")
+
+    def __init__(self, profiler: "Profiler", name: str, items: int):
+        self.profiler = profiler
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(
+            self.name,
+            time.perf_counter() - self.wall,
+            time.process_time() - self.cpu,
+            self.items,
+        )
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+
+    def stage(self, name: str, items: int = 1):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, items)
+
+    def record(self, name: str, wall: float, cpu: float, items: int = 1):
+        if not self.enabled or items <= 0:
+            return
+        with self._lock:
+            self.records.append((name, wall, cpu, items))
+
+    def extend(self, records: list):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.records.extend(tuple(record) for record in records)
+
+    def summary(self) -> dict:
+        with self._lock:
+            records = list(self.records)
+
+        stages = {}
+        for name, wall, cpu, items in records:
+            stages.setdefault(name, []).append((wall, cpu, items))
+
+        summary = {}
+        for name, calls in stages.items():
+            items = sum(call[2] for call in calls)
+            wall = sum(call[0] for call in calls)
+            latencies = [(call[0] / call[2], call[2]) for call in calls]
+            summary[name] = {
+                "calls": len(calls),
+                "items": items,
+                "wall_s": wall,
+                "cpu_s": sum(call[1] for call in calls),
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "items_per_s": items / wall if wall > 0 else 0.0,
+            }
+        return summary
+
+    def save(self, path: str):
+        with self._lock:
+            records = list(self.records)
+        with open(path, "w", encoding="utf-8") as f:
+            for name, wall, cpu, items in records:
+                f.write(
+                    json.dumps(
+                        {"stage": name, "wall_s": wall, "cpu_s": cpu, "items": items},
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                )
+        logging.info(f"Stage timings saved to {path}")
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        table = [
+            [
+                name,
+                stats["items"],
+                f"{stats['wall_s']:.2f}",
+                f"{stats['cpu_s']:.2f}",
+                f"{stats['p50_ms']:.1f}",
+                f"{stats['p95_ms']:.1f}",
+                f"{stats['p99_ms']:.1f}",
+                f"{stats['items_per_s']:.1f}",
+            ]
+            for name, stats in summary.items()
+        ]
+        headers = [
+            "Stage",
+            "Items",
+            "Wall (s)",
+            "CPU (s)",
+            "p50 (ms)",
+            "p95 (ms)",
+            "p99 (ms)",
+            "Items/s",
+        ]
+        print(tabulate.tabulate(table, headers=headers, tablefmt="grid"))
+
+
+def percentile(values: list[tuple[float, int]], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    total = sum(weight for _, weight in ordered)
+    threshold = total * q / 100
+    seen = 0
+    for value, weight in ordered:
+        seen += weight
+        if seen >= threshold:
+            return value
+    return ordered[-1][0]
+
+
+PROFILER = Profiler()
@@ -0,0 +1,103 @@
+import logging
+import threading
+
+import tabulate
+
+_MODELS = {}
+_FOOTPRINTS = {}
+_LOCK = threading.RLock()
+
+
+def shared(cls, *args, **kwargs):
+    key = (
+        f"{cls.__module__}.{cls.__qualname__}",
+        getattr(cls, "MODEL_ID", None),
+        args,
+        tuple(sorted(kwargs.items())),
+    )
+    with _LOCK:
+        if key not in _MODELS:
+            before = _resident_bytes()
+            instance = cls(*args, **kwargs)
+            after = _resident_bytes()
+            _MODELS[key] = instance
+            _FOOTPRINTS[key] = {
+                "parameters": _parameter_bytes(instance),
+                "resident": None if before is None else max(after - before, 0),
+            }
+            logging.debug(f"Loaded shared model {key[0]} ({key[1]}) with {args}")
+        return _MODELS[key]
+
+
+def loaded_models() -> list[dict]:
+    with _LOCK:
+        return [
+            {
+                "class": key[0],
+                "model_id": key[1],
+                "args": key[2] + tuple(f"{k}={v}" for k, v in key[3]),
+                **_FOOTPRINTS[key],
+            }
+            for key in _MODELS
+        ]
+
+
+def clear():
+    with _LOCK:
+        _MODELS.clear()
+        _FOOTPRINTS.clear()
+
+
+def log_footprints():
+    models = loaded_models()
+    if not models:
+        return
+
+    def mb(value):
+        return "-" if value is None else f"{value / 1024 / 1024:.1f}"
+
+    table = [
+        [
+            model["class"].rsplit(".", 1)[-1],
+            model["model_id"] or "-",
+            ", ".join(str(arg) for arg in model["args"]) or "-",
+            mb(model["parameters"]),
+            mb(model["resident"]),
+        ]
+        for model in models
+    ]
+    logging.info(f"{len(models)} shared models loaded")
+    print(
+        tabulate.tabulate(
+            table,
+            headers=["Model", "Model ID", "Args", "Weights (MB)", "RSS delta (MB)"],
+            tablefmt="grid",
+        )
+    )
+
+
+def _parameter_bytes(instance) -> int | None:
+    total = None
+    for value in vars(instance).values():
+        model = getattr(value, "model", None)
+        if model is None or not hasattr(model, "parameters"):
+            continue
+        tensors = list(model.parameters()) + list(model.buffers())
+        total = (total or 0) + sum(t.numel() * t.element_size() for t in tensors)
+    return total
+
+
+def _resident_bytes() -> int | None:
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    process = psutil.Process()
+    total = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
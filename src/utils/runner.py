@@ -0,0 +1,130 @@
+import logging
+import os
+from typing import Iterator
+
+from utils.cache import CACHE_DIR, ResultCache
+
+
+def open_cache(config: dict) -> ResultCache | None:
+    cache = config.get("cache", False)
+    if not cache:
+        return None
+    path = cache if isinstance(cache, str) else f"{CACHE_DIR}/text_results.sqlite"
+    return ResultCache(path, max_size_mb=config.get("cache_size_mb", 512))
+
+
+def open_spectrograms(config: dict, output_dir: str, workers: int | None = None):
+    from voice.spectrogram import SpectrogramWriter
+
+    return SpectrogramWriter(
+        output_dir,
+        workers=config.get("spectrogram_workers", 0) if workers is None else workers,
+        formats=config.get("spectrogram_formats", ["png"]),
+    )
+
+
+def build_pipelines(config: dict, cache=None, spectrograms=None) -> tuple:
+    from text.pipeline import TextAnalysisPipeline
+
+    backend = config.get("backend", "torch")
+    text_pipeline = TextAnalysisPipeline(
+        batch_size=config.get("batch_size", 32),
+        cache=cache,
+        backend=backend,
+        correction=config.get("correction", "full"),
+        correction_servers=config.get("correction_servers", 1),
+        correction_in_flight=config.get("correction_in_flight", 1),
+        cascade=config.get("cascade", False),
+        cascade_threshold=config.get("cascade_threshold", 0.8),
+        cascade_audit=config.get("cascade_audit", 0.05),
+    )
+    if config.get("mode", "text") != "audio":
+        return text_pipeline, None
+
+    from voice.pipeline import VoiceAnalysisPipeline
+
+    segmenter = None
+    if config.get("segment", False):
+        from voice.segmentation import Segmenter
+
+        segmenter = Segmenter(
+            max_seconds=config.get("segment_seconds", 30.0),
+            stride_seconds=config.get("segment_stride", 1.0),
+            threshold_db=config.get("segment_threshold_db", -40.0),
+        )
+
+    feature_store = None
+    if config.get("feature_store", False):
+        from voice.store import STORE_DIR, FeatureStore
+
+        store = config["feature_store"]
+        feature_store = FeatureStore(store if isinstance(store, str) else STORE_DIR)
+
+    voice_pipeline = VoiceAnalysisPipeline(
+        spectrograms=spectrograms,
+        max_batch_seconds=config.get("max_batch_seconds", 60.0),
+        backend=backend,
+        concurrent=config.get("concurrent", False),
+        text_pipeline=text_pipeline,
+        segmenter=segmenter,
+        feature_store=feature_store,
+    )
+    return text_pipeline, voice_pipeline
+
+
+def analyze_items(text_pipeline, voice_pipeline, items: list) -> Iterator[dict]:
+    if voice_pipeline is None:
+        return text_pipeline.analyze_iter(items)
+    return voice_pipeline.analyze_entries(items)
+
+
+def pipeline_stats(text_pipeline) -> dict:
+    cache = text_pipeline.cache
+    cascade = text_pipeline.cascade
+    return {
+        "cache_hits": cache.hits if cache is not None else 0,
+        "cache_misses": cache.misses if cache is not None else 0,
+        "corrected": text_pipeline.corrector.checked,
+        "correction_skipped": text_pipeline.corrector.skipped,
+        "cascade_resolved": cascade.resolved if cascade is not None else 0,
+        "cascade_escalated": cascade.escalated if cascade is not None else 0,
+        "cascade_audited": cascade.audited if cascade is not None else 0,
+        "cascade_agreed": cascade.agreed if cascade is not None else 0,
+    }
+
+
+def stats_delta(after: dict, before: dict) -> dict:
+    return {key: after[key] - before.get(key, 0) for key in after}
+
+
+def merge_stats(total: dict, stats: dict) -> dict:
+    return {key: total.get(key, 0) + stats.get(key, 0) for key in {*total, *stats}}
+
+
+def log_stats(config: dict, stats: dict):
+    logging.info(
+        f"Correction ({config.get('correction', 'full')}): "
+        f"{stats.get('corrected', 0)} checked, "
+        f"{stats.get('correction_skipped', 0)} skipped"
+    )
+    if config.get("cache", False):
+        hits = stats.get("cache_hits", 0)
+        total = hits + stats.get("cache_misses", 0)
+        rate = hits / total if total else 0.0
+        logging.info(
+            f"Text cache: {hits} hits, {total - hits} misses ({rate:.1%} hit rate)"
+        )
+    if config.get("cascade", False):
+        escalated = stats.get("cascade_escalated", 0)
+        total = escalated + stats.get("cascade_resolved", 0)
+        audited = stats.get("cascade_audited", 0)
+        agreement = stats.get("cascade_agreed", 0) / audited if audited else 0.0
+        logging.info(
+            f"Emotion cascade: {escalated}/{total} escalated to the model "
+            f"({escalated / total if total else 0.0:.1%}), lexicon agreed with the "
+            f"model on {agreement:.1%} of {audited} audited texts"
+        )
+
+
+def spectrogram_dir(filepath: str) -> str:
+    return os.path.splitext(filepath)[0]
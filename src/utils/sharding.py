@@ -0,0 +1,102 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from utils.logger import setup_logger
+from utils.profiler import PROFILER
+from utils.runner import (
+    analyze_items,
+    build_pipelines,
+    merge_stats,
+    open_cache,
+    open_spectrograms,
+    pipeline_stats,
+    stats_delta,
+)
+
+_WORKER = {}
+
+
+def worker_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _init_worker(config: dict, output_dir: str | None, threads: int, log_level, profile):
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[name] = str(threads)
+    setup_logger(logging.getLevelName(log_level))
+    if profile:
+        PROFILER.enable()
+
+    import torch
+
+    torch.set_num_threads(threads)
+
+    spectrograms = None
+    if output_dir is not None:
+        spectrograms = open_spectrograms(config, output_dir, workers=0)
+    text_pipeline, voice_pipeline = build_pipelines(
+        config, cache=open_cache(config), spectrograms=spectrograms
+    )
+    _WORKER.update(text_pipeline=text_pipeline, voice_pipeline=voice_pipeline)
+
+
+def _analyze_shard(items: list) -> tuple[list[dict], list, dict]:
+    text_pipeline = _WORKER["text_pipeline"]
+    before = pipeline_stats(text_pipeline)
+    PROFILER.reset()
+
+    results = list(analyze_items(text_pipeline, _WORKER["voice_pipeline"], items))
+
+    if text_pipeline.cache is not None:
+        text_pipeline.cache.commit()
+    return results, PROFILER.records, stats_delta(pipeline_stats(text_pipeline), before)
+
+
+class ShardedRunner:
+    def __init__(
+        self,
+        config: dict,
+        workers: int,
+        output_dir: str | None = None,
+        chunk_size: int | None = None,
+    ):
+        self.config = config
+        self.workers = workers
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.stats = {}
+
+    def analyze(self, items: list) -> Iterator[dict]:
+        chunk_size = self.chunk_size or self._default_chunk_size(len(items))
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        threads = worker_threads(self.workers)
+        logging.info(
+            f"Sharding {len(items)} items into {len(chunks)} chunks across "
+            f"{self.workers} workers with {threads} threads each"
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                self.config,
+                self.output_dir,
+                threads,
+                logging.getLogger().level,
+                PROFILER.enabled,
+            ),
+        ) as executor:
+            for results, records, stats in executor.map(_analyze_shard, chunks):
+                PROFILER.extend(records)
+                self.stats = merge_stats(self.stats, stats)
+                yield from results
+
+    def _default_chunk_size(self, count: int) -> int:
+        if self.config.get("mode", "text") == "audio":
+            return max(1, min(8, count // (self.workers * 4)))
+        batch_size = self.config.get("batch_size", 32)
+        return max(batch_size, min(batch_size * 8, count // (self.workers * 4)))
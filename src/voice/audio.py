@@ -0,0 +1,56 @@
+import librosa
+import numpy as np
+
+
+class AudioClip:
+    def __init__(
+        self, path: str, waveform: np.ndarray, sampling_rate: int, store=None
+    ):
+        self.path = path
+        self.waveform = waveform
+        self.sampling_rate = sampling_rate
+        self.store = store
+        self._resampled = {sampling_rate: waveform}
+
+    @classmethod
+    def load(cls, path: str, store=None) -> "AudioClip":
+        if store is not None:
+            cached = store.get(path, "native")
+            if cached is not None:
+                return cls(path, *cached, store=store)
+
+        waveform, sampling_rate = librosa.load(path, sr=None, mono=True)
+        waveform = waveform.astype(np.float32, copy=False)
+        if store is not None:
+            waveform = store.put(path, "native", int(sampling_rate), waveform)
+        return cls(path, waveform, int(sampling_rate), store=store)
+
+    @property
+    def duration(self) -> float:
+        return len(self.waveform) / self.sampling_rate
+
+    def at(self, sampling_rate: int) -> np.ndarray:
+        if sampling_rate in self._resampled:
+            return self._resampled[sampling_rate]
+
+        cached = None
+        if self.store is not None:
+            cached = self.store.get(self.path, "waveform", sampling_rate)
+        if cached is not None:
+            waveform = cached[0]
+        else:
+            waveform = librosa.resample(
+                np.asarray(self.waveform),
+                orig_sr=self.sampling_rate,
+                target_sr=sampling_rate,
+            )
+            if self.store is not None:
+                waveform = self.store.put(self.path, "waveform", sampling_rate, waveform)
+        self._resampled[sampling_rate] = waveform
+        return waveform
+
+
+def model_input(audio: "str | AudioClip", sampling_rate: int):
+    if isinstance(audio, AudioClip):
+        return {"raw": audio.at(sampling_rate), "sampling_rate": sampling_rate}
+    return audio
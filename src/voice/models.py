@@ -1,44 +1,66 @@
-from transformers import pipeline
+from utils.backends import load_pipeline
+from voice.audio import AudioClip, model_input
 
 
 class SpeechToTextModel:
-    def __init__(self, device: str):
-        self.asr = pipeline(
-            "automatic-speech-recognition",
-            model="openai/whisper-base",
-            device=device,
+    MODEL_ID = "openai/whisper-base"
+
+    def __init__(self, device: str, backend: str = "torch"):
+        self.backend = backend
+        self.asr = load_pipeline(
+            "automatic-speech-recognition", self.MODEL_ID, device, backend
         )
+        self.sampling_rate = self.asr.feature_extractor.sampling_rate
 
-    def transcribe(self, audio_path: str) -> str:
-        result = self.asr(audio_path)
+    def transcribe(self, audio: str | AudioClip) -> str:
+        result = self.asr(model_input(audio, self.sampling_rate))
         return result["text"]
 
+    def transcribe_many(self, clips: list[AudioClip]) -> list[str]:
+        if not clips:
+            return []
+        inputs = [model_input(clip, self.sampling_rate) for clip in clips]
+        results = self.asr(inputs, batch_size=len(inputs))
+        return [result["text"] for result in results]
+
 
 class VoiceEmotionModel:
-    def __init__(self, device: str):
-        self.classifier = pipeline(
-            "audio-classification",
-            model="superb/wav2vec2-base-superb-er",
-            device=device,
+    MODEL_ID = "superb/wav2vec2-base-superb-er"
+    pad_mapping = {
+        "joy": {"valence": "positive", "arousal": "high"},
+        "surprise": {"valence": "positive", "arousal": "high"},
+        "anger": {"valence": "negative", "arousal": "high"},
+        "fear": {"valence": "negative", "arousal": "high"},
+        "disgust": {"valence": "negative", "arousal": "low"},
+        "sadness": {"valence": "negative", "arousal": "low"},
+        "neutral": {"valence": "neutral", "arousal": "neutral"},
+    }
+    label_map = {
+        "hap": "joy",
+        "sad": "sadness",
+        "ang": "anger",
+        "neu": "neutral",
+    }
+
+    def __init__(self, device: str, backend: str = "torch"):
+        self.backend = backend
+        self.classifier = load_pipeline(
+            "audio-classification", self.MODEL_ID, device, backend
         )
-        self.pad_mapping = {
-            "joy": {"valence": "positive", "arousal": "high"},
-            "surprise": {"valence": "positive", "arousal": "high"},
-            "anger": {"valence": "negative", "arousal": "high"},
-            "fear": {"valence": "negative", "arousal": "high"},
-            "disgust": {"valence": "negative", "arousal": "low"},
-            "sadness": {"valence": "negative", "arousal": "low"},
-            "neutral": {"valence": "neutral", "arousal": "neutral"},
-        }
-        self.label_map = {
-            "hap": "joy",
-            "sad": "sadness",
-            "ang": "anger",
-            "neu": "neutral",
-        }
+        self.sampling_rate = self.classifier.feature_extractor.sampling_rate
+
+    def predict(self, audio: str | AudioClip) -> dict:
+        results = self.classifier(model_input(audio, self.sampling_rate), top_k=3)
+        return self._dimensions(results)
+
+    def predict_many(self, clips: list[AudioClip]) -> list[dict]:
+        if not clips:
+            return []
+        inputs = [model_input(clip, self.sampling_rate) for clip in clips]
+        results = self.classifier(inputs, top_k=3, batch_size=1)
+        return [self._dimensions(result) for result in results]
 
-    def predict(self, audio_path: str) -> dict:
-        results = self.classifier(audio_path, top_k=3)
+    def _dimensions(self, results: list[dict]) -> dict:
         label = results[0]["label"]
         dimensions = self.pad_mapping.get(
             label, {"valence": "neutral", "arousal": "neutral"}
@@ -1,30 +1,287 @@
-from typing import Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List
 import os
 
-import librosa
-import librosa.display
-import matplotlib.pyplot as plt
-import numpy as np
 import torch
 
-from text.pipeline import TextAnalysisPipeline
+from text.pipeline import TextAnalysisPipeline, combine_results
+from utils.backends import check_backend
+from utils.cache import ResultCache
+from utils.profiler import PROFILER
+from utils.registry import shared
+from voice.audio import AudioClip
 from voice.models import SpeechToTextModel, VoiceEmotionModel
+from voice.segmentation import (
+    AudioSegment,
+    Segmenter,
+    aggregate_emotions,
+    drop_overlap,
+)
+from voice.spectrogram import SpectrogramWriter
+from voice.store import FeatureStore
+
+
+def voice_model_classes(backend: str) -> tuple:
+    check_backend(backend)
+    if backend == "stub":
+        from voice.stubs import StubSpeechToTextModel, StubVoiceEmotionModel
+
+        return StubSpeechToTextModel, StubVoiceEmotionModel
+    return SpeechToTextModel, VoiceEmotionModel
 
 
 class VoiceAnalysisPipeline:
-    def __init__(self, device: str | None = None):
+    def __init__(
+        self,
+        device: str | None = None,
+        cache: ResultCache | None = None,
+        spectrograms: SpectrogramWriter | None = None,
+        max_batch_seconds: float = 60.0,
+        backend: str = "torch",
+        concurrent: bool = False,
+        text_pipeline: TextAnalysisPipeline | None = None,
+        segmenter: Segmenter | None = None,
+        feature_store: FeatureStore | None = None,
+    ):
         if device is None:
             device = "cuda" if torch.cuda.is_available() else "cpu"
 
-        self.stt = SpeechToTextModel(device)
-        self.voice_emotion = VoiceEmotionModel(device)
-        self.text_pipeline = TextAnalysisPipeline(device)
+        stt_cls, emotion_cls = voice_model_classes(backend)
+
+        self.stt = shared(stt_cls, device, backend=backend)
+        self.voice_emotion = shared(emotion_cls, device, backend=backend)
+        if text_pipeline is None:
+            text_pipeline = TextAnalysisPipeline(device, cache=cache, backend=backend)
+        self.text_pipeline = text_pipeline
+        self.spectrograms = spectrograms
+        self.max_batch_seconds = max_batch_seconds
+        self.concurrent = concurrent
+        self.segmenter = segmenter
+        self.feature_store = feature_store
+
+    def analyze(self, audio_path: str, spectrogram_name: str | None = None) -> dict:
+        with PROFILER.stage("audio.decode"):
+            clip = AudioClip.load(audio_path, self.feature_store)
+
+        if self.concurrent:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                future = pool.submit(self._predict_emotions, [clip])
+                transcription = self._transcribe([clip])[0]
+                text_result = self.text_pipeline.analyze(transcription)
+                voice_emotion = future.result()[0]
+        else:
+            transcription = self._transcribe([clip])[0]
+            text_result = self.text_pipeline.analyze(transcription)
+            voice_emotion = self._predict_emotions([clip])[0]
+
+        self._save_spectrogram(clip, spectrogram_name)
+
+        return self._build_result(audio_path, transcription, voice_emotion, text_result)
+
+    def analyze_many(self, entry: Dict) -> List[Dict]:
+        return list(self.analyze_entries([entry]))
+
+    def analyze_paths(self, audio_paths: list[str]) -> List[Dict]:
+        with PROFILER.stage("audio.decode", len(audio_paths)):
+            clips = [AudioClip.load(path, self.feature_store) for path in audio_paths]
+        transcriptions = self._transcribe(clips)
+        text_results = self.text_pipeline.analyze_many(transcriptions)
+        voice_emotions = self._predict_emotions(clips)
+        return [
+            self._build_result(clip.path, *fields)
+            for clip, *fields in zip(clips, transcriptions, voice_emotions, text_results)
+        ]
+
+    def analyze_entries(self, entries: Iterable[Dict]) -> Iterator[Dict]:
+        if self.segmenter is not None:
+            yield from self._analyze_entries_segmented(entries)
+            return
+        if self.concurrent:
+            yield from self._analyze_entries_concurrent(entries)
+            return
+
+        for batch in self._iter_batches(entries):
+            clips = [clip for _, clip in batch]
+            transcriptions = self._transcribe(clips)
+            text_results = self.text_pipeline.analyze_many(transcriptions)
+            voice_emotions = self._predict_emotions(clips)
+            yield from self._collect_batch(
+                batch, transcriptions, voice_emotions, text_results
+            )
+
+    def _analyze_entries_concurrent(self, entries: Iterable[Dict]) -> Iterator[Dict]:
+        batches = self._iter_batches(entries)
+        with ThreadPoolExecutor(max_workers=1) as decoder, ThreadPoolExecutor(
+            max_workers=1
+        ) as emotion_pool, ThreadPoolExecutor(max_workers=1) as text_pool:
+            next_batch = decoder.submit(next, batches, None)
+            pending = None
+            while True:
+                batch = next_batch.result()
+                if batch is None:
+                    break
+                next_batch = decoder.submit(next, batches, None)
+
+                clips = [clip for _, clip in batch]
+                voice_emotions = emotion_pool.submit(self._predict_emotions, clips)
+                transcriptions = self._transcribe(clips)
+                text_results = text_pool.submit(
+                    self.text_pipeline.analyze_many, transcriptions
+                )
+
+                if pending is not None:
+                    yield from self._collect_pending(*pending)
+                pending = (batch, transcriptions, voice_emotions, text_results)
 
-    def analyze(self, audio_path: str) -> dict:
-        transcription = self.stt.transcribe(audio_path)
-        text_result = self.text_pipeline.analyze(transcription)
-        voice_emotion = self.voice_emotion.predict(audio_path)
+            if pending is not None:
+                yield from self._collect_pending(*pending)
 
+    def _analyze_entries_segmented(self, entries: Iterable[Dict]) -> Iterator[Dict]:
+        for entry in entries:
+            for path in entry.get("files") or []:
+                result = self.analyze_segmented(path, entry["set_id"])
+                yield self._with_metadata(result, entry, path)
+
+    def analyze_segmented(self, audio_path: str, name: str | None = None) -> dict:
+        if name is None:
+            name = os.path.basename(audio_path).rsplit(".", 1)[0]
+        else:
+            name = f"{name}_{os.path.basename(audio_path).rsplit('.', 1)[0]}"
+
+        segments = []
+        previous = ""
+        for batch in self._iter_segment_batches(audio_path):
+            transcriptions = []
+            for segment, transcription in zip(batch, self._transcribe(batch)):
+                transcriptions.append(
+                    drop_overlap(previous, transcription, segment.context)
+                )
+                previous = transcription
+            text_results = self.text_pipeline.analyze_many(transcriptions)
+            voice_emotions = self._predict_emotions(batch)
+            for segment, transcription, voice_emotion, text_result in zip(
+                batch, transcriptions, voice_emotions, text_results
+            ):
+                self._save_spectrogram(segment, f"{name}_{len(segments):04d}")
+                segments.append(
+                    {
+                        "start": round(segment.start + segment.context, 3),
+                        "end": round(segment.end, 3),
+                        "transcription": transcription,
+                        "voice_emotion": voice_emotion,
+                        "text_analysis": text_result,
+                    }
+                )
+
+        transcription = " ".join(
+            segment["transcription"] for segment in segments if segment["transcription"]
+        )
+        result = self._build_result(
+            audio_path,
+            transcription,
+            aggregate_emotions(segments),
+            combine_results(
+                [segment["text_analysis"] for segment in segments],
+                [len(segment["transcription"].split()) for segment in segments],
+            ),
+        )
+        result["segments"] = segments
+        return result
+
+    def _iter_segment_batches(self, audio_path: str) -> Iterator[list[AudioSegment]]:
+        batch = []
+        seconds = 0.0
+        segments = self.segmenter.segments(audio_path)
+        while True:
+            with PROFILER.stage("audio.decode"):
+                segment = next(segments, None)
+            if segment is None:
+                break
+            batch.append(segment)
+            seconds += segment.duration
+            if seconds >= self.max_batch_seconds:
+                yield batch
+                batch = []
+                seconds = 0.0
+        if batch:
+            yield batch
+
+    def _collect_pending(
+        self,
+        batch: list[tuple[Dict, AudioClip]],
+        transcriptions: list[str],
+        voice_emotions: Future,
+        text_results: Future,
+    ) -> Iterator[Dict]:
+        return self._collect_batch(
+            batch, transcriptions, voice_emotions.result(), text_results.result()
+        )
+
+    def _iter_batches(
+        self, entries: Iterable[Dict]
+    ) -> Iterator[list[tuple[Dict, AudioClip]]]:
+        batch = []
+        seconds = 0.0
+        for entry in entries:
+            for path in entry.get("files") or []:
+                with PROFILER.stage("audio.decode"):
+                    clip = AudioClip.load(path, self.feature_store)
+                batch.append((entry, clip))
+                seconds += clip.duration
+                if seconds >= self.max_batch_seconds:
+                    yield batch
+                    batch = []
+                    seconds = 0.0
+        if batch:
+            yield batch
+
+    def _transcribe(self, clips: list[AudioClip]) -> list[str]:
+        with PROFILER.stage("audio.transcribe", len(clips)):
+            return self.stt.transcribe_many(clips)
+
+    def _predict_emotions(self, clips: list[AudioClip]) -> list[dict]:
+        with PROFILER.stage("audio.emotion", len(clips)):
+            return self.voice_emotion.predict_many(clips)
+
+    def _collect_batch(
+        self,
+        batch: list[tuple[Dict, AudioClip]],
+        transcriptions: list[str],
+        voice_emotions: list[dict],
+        text_results: list[dict],
+    ) -> Iterator[Dict]:
+        for (entry, clip), transcription, voice_emotion, text_result in zip(
+            batch, transcriptions, voice_emotions, text_results
+        ):
+            name = f"{entry['set_id']}_{os.path.basename(clip.path).rsplit('.', 1)[0]}"
+            self._save_spectrogram(clip, name)
+
+            result = self._build_result(
+                clip.path, transcription, voice_emotion, text_result
+            )
+            yield self._with_metadata(result, entry, clip.path)
+
+    def _with_metadata(self, result: dict, entry: Dict, audio_path: str) -> dict:
+        result["id"] = entry["set_id"]
+        result["metadata"] = {
+            "audio_path": audio_path,
+            "set_id": entry["set_id"],
+            "gender": entry["gender"],
+            "age": entry["age"],
+            "country": entry["country"],
+        }
+        return result
+
+    def _save_spectrogram(self, clip: AudioClip, name: str | None = None):
+        if self.spectrograms is None:
+            return
+        if name is None:
+            name = os.path.basename(clip.path).rsplit(".", 1)[0]
+        self.spectrograms.submit(clip, name)
+
+    def _build_result(
+        self, audio_path: str, transcription: str, voice_emotion: dict, text_result: dict
+    ) -> dict:
         return {
             "audio_path": audio_path,
             "transcription": transcription,
@@ -32,36 +289,3 @@ class VoiceAnalysisPipeline:
             "text_analysis": text_result,
         }
 
-    def analyze_many(self, entry: Dict) -> List[Dict]:
-        audio_paths = entry.get("files")
-        if not audio_paths:
-            return []
-
-        results = []
-        for path in audio_paths:
-            result = self.analyze(path)
-            result["id"] = entry["set_id"]
-            result["metadata"] = {
-                "audio_path": path,
-                "set_id": entry["set_id"],
-                "gender": entry["gender"],
-                "age": entry["age"],
-                "country": entry["country"],
-            }
-            results.append(result)
-        return results
-
-
-def save_spectrogram(audio_path: str, output_path: str):
-    y, sr = librosa.load(audio_path)
-
-    S = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=128)
-    S_dB = librosa.power_to_db(S, ref=np.max)
-
-    plt.figure(figsize=(10, 4))
-    librosa.display.specshow(S_dB, sr=sr, x_axis="time", y_axis="mel")
-    plt.colorbar(format="%+2.0f dB")
-    plt.title("Mel-frequency spectrogram")
-    plt.tight_layout()
-    plt.savefig(output_path)
-    plt.close()
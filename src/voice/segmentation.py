@@ -0,0 +1,160 @@
+import re
+from collections import defaultdict
+from typing import Iterator
+
+import numpy as np
+import soundfile as sf
+
+from voice.audio import AudioClip
+
+_PUNCTUATION = re.compile(r"[^\w']+")
+
+
+class AudioSegment(AudioClip):
+    def __init__(
+        self,
+        path: str,
+        waveform: np.ndarray,
+        sampling_rate: int,
+        start: float,
+        context: float = 0.0,
+    ):
+        super().__init__(path, waveform, sampling_rate)
+        self.start = start
+        self.context = context
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+class Segmenter:
+    def __init__(
+        self,
+        max_seconds: float = 30.0,
+        stride_seconds: float = 1.0,
+        min_silence_seconds: float = 0.3,
+        threshold_db: float = -40.0,
+        frame_seconds: float = 0.03,
+        block_seconds: float = 10.0,
+    ):
+        if stride_seconds >= max_seconds:
+            raise ValueError("Segment stride must be shorter than the segment length")
+        self.max_seconds = max_seconds
+        self.stride_seconds = stride_seconds
+        self.min_silence_seconds = min_silence_seconds
+        self.threshold_db = threshold_db
+        self.frame_seconds = frame_seconds
+        self.block_seconds = block_seconds
+
+    def segments(self, path: str) -> Iterator[AudioSegment]:
+        sampling_rate = sf.info(path).samplerate
+        max_samples = int(self.max_seconds * sampling_rate)
+        blocksize = int(self.block_seconds * sampling_rate)
+
+        buffer = np.zeros(0, dtype=np.float32)
+        offset = 0
+        context = 0
+        for block in sf.blocks(path, blocksize=blocksize, dtype="float32", always_2d=True):
+            buffer = np.concatenate([buffer, block.mean(axis=1)])
+            while len(buffer) >= max_samples:
+                cut, overlap = self._cut(buffer[:max_samples], sampling_rate)
+                yield from self._segment(
+                    path, buffer[:cut], sampling_rate, offset, context
+                )
+                keep = cut - overlap
+                buffer = buffer[keep:]
+                offset += keep
+                context = overlap
+
+        if len(buffer):
+            yield from self._segment(path, buffer, sampling_rate, offset, context)
+
+    def _frame_db(self, waveform: np.ndarray, sampling_rate: int) -> tuple[np.ndarray, int]:
+        frame = max(1, int(self.frame_seconds * sampling_rate))
+        frames = len(waveform) // frame
+        if frames == 0:
+            return np.zeros(0), frame
+        rms = np.sqrt(
+            np.mean(np.square(waveform[: frames * frame].reshape(frames, frame)), axis=1)
+        )
+        return 20 * np.log10(np.maximum(rms, 1e-10)), frame
+
+    def _cut(self, window: np.ndarray, sampling_rate: int) -> tuple[int, int]:
+        db, frame = self._frame_db(window, sampling_rate)
+        silent = db < self.threshold_db
+        min_run = max(1, int(self.min_silence_seconds / self.frame_seconds))
+
+        run = 0
+        for i in range(len(silent) - 1, len(silent) // 2, -1):
+            run = run + 1 if silent[i] else 0
+            if run >= min_run:
+                return (i + run // 2) * frame, 0
+        return len(window), int(self.stride_seconds * sampling_rate)
+
+    def _segment(
+        self,
+        path: str,
+        waveform: np.ndarray,
+        sampling_rate: int,
+        offset: int,
+        context: int = 0,
+    ) -> Iterator[AudioSegment]:
+        db, _ = self._frame_db(waveform, sampling_rate)
+        if not (db >= self.threshold_db).any():
+            return
+        yield AudioSegment(
+            path,
+            waveform.copy(),
+            sampling_rate,
+            offset / sampling_rate,
+            context / sampling_rate,
+        )
+
+
+def drop_overlap(previous: str, text: str, context: float) -> str:
+    words = text.split()
+    if not previous or not words or context <= 0:
+        return text.strip()
+
+    def normalize(tokens: list[str]) -> list[str]:
+        return [_PUNCTUATION.sub("", token.lower()) for token in tokens]
+
+    tail = normalize(previous.split()[-(int(context * 4) + 2) :])
+    head = normalize(words[: len(tail) + 1])
+    for size in range(min(len(tail), len(head)), 0, -1):
+        for trim_tail, trim_head in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            if (trim_tail or trim_head) and size < 2:
+                continue
+            end = len(tail) - trim_tail
+            if end - size < 0 or trim_head + size > len(head):
+                continue
+            if tail[end - size : end] == head[trim_head : trim_head + size]:
+                return " ".join(words[trim_head + size + trim_tail :])
+    return text.strip()
+
+
+def aggregate_emotions(segments: list[dict]) -> dict:
+    weights = defaultdict(float)
+    scores = defaultdict(float)
+    dimensions = {}
+    for segment in segments:
+        emotion = segment["voice_emotion"]
+        seconds = segment["end"] - segment["start"]
+        weights[emotion["label"]] += seconds
+        scores[emotion["label"]] += emotion["score"] * seconds
+        dimensions.setdefault(emotion["label"], emotion)
+
+    if not weights:
+        return {"label": "neutral", "valence": "neutral", "arousal": "neutral", "score": 0.0}
+
+    label = max(weights, key=weights.get)
+    total = sum(weights.values())
+    return {
+        "label": label,
+        "valence": dimensions[label]["valence"],
+        "arousal": dimensions[label]["arousal"],
+        "score": scores[label] / weights[label],
+        "share": weights[label] / total,
+        "distribution": {name: weight / total for name, weight in weights.items()},
+    }
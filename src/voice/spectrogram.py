@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import librosa
+import numpy as np
+
+from utils.profiler import PROFILER
+from voice.audio import AudioClip
+
+SPECTROGRAM_SAMPLING_RATE = 22050
+SPECTROGRAM_FORMATS = ("png", "npy", "npz")
+
+
+def mel_spectrogram_db(y: np.ndarray, sr: int) -> np.ndarray:
+    S = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=128)
+    return librosa.power_to_db(S, ref=np.max).astype(np.float32)
+
+
+def render_spectrogram(
+    y: np.ndarray | None,
+    sr: int,
+    output_base: str,
+    formats: tuple,
+    S_dB: np.ndarray | None = None,
+    store=None,
+    path: str | None = None,
+) -> tuple[float, float]:
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    if S_dB is None:
+        S_dB = mel_spectrogram_db(y, sr)
+        if store is not None:
+            S_dB = store.put(path, "mel", sr, S_dB)
+
+    if "npy" in formats:
+        np.save(f"{output_base}.npy", S_dB)
+    if "npz" in formats:
+        np.savez_compressed(f"{output_base}.npz", S_dB=S_dB, sr=sr)
+    if "png" in formats:
+        plot_spectrogram(S_dB, sr, f"{output_base}.png")
+
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def plot_spectrogram(S_dB: np.ndarray, sr: int, output_path: str):
+    import librosa.display
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    img = librosa.display.specshow(S_dB, sr=sr, x_axis="time", y_axis="mel", ax=ax)
+    fig.colorbar(img, ax=ax, format="%+2.0f dB")
+    ax.set_title("Mel-frequency spectrogram")
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+class SpectrogramWriter:
+    def __init__(
+        self,
+        output_dir: str,
+        workers: int = 0,
+        formats: tuple | list = ("png",),
+    ):
+        unknown = set(formats) - set(SPECTROGRAM_FORMATS)
+        if unknown:
+            raise ValueError(
+                f"Unknown spectrogram formats {sorted(unknown)}, "
+                f"expected any of {SPECTROGRAM_FORMATS}"
+            )
+        self.output_dir = output_dir
+        self.formats = tuple(formats)
+        self.workers = workers
+        self._executor = None
+        self._futures: list[Future] = []
+        if workers > 0 and self.formats:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, clip: AudioClip, name: str):
+        if not self.formats:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        sr = SPECTROGRAM_SAMPLING_RATE
+        output_base = os.path.join(self.output_dir, name)
+
+        cached = None
+        if clip.store is not None:
+            cached = clip.store.get(clip.path, "mel", sr)
+        if cached is not None:
+            args = (None, sr, output_base, self.formats, cached[0])
+        else:
+            y = clip.at(sr)
+            args = (y, sr, output_base, self.formats, None, clip.store, clip.path)
+
+        if self._executor is None:
+            PROFILER.record("audio.spectrogram", *render_spectrogram(*args))
+            return
+
+        self._futures.append(self._executor.submit(render_spectrogram, *args))
+        while len(self._futures) > self.workers * 4:
+            self._wait(self._futures.pop(0))
+
+    def close(self):
+        for future in self._futures:
+            self._wait(future)
+        self._futures = []
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _wait(self, future: Future):
+        try:
+            PROFILER.record("audio.spectrogram", *future.result())
+        except Exception as e:
+            logging.error(f"Failed to render spectrogram: {e}")
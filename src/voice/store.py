@@ -0,0 +1,90 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from utils.cache import CACHE_DIR
+
+STORE_DIR = os.path.join(CACHE_DIR, "features")
+
+
+class FeatureStore:
+    def __init__(self, root: str = STORE_DIR):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(root, "index.sqlite"), timeout=30, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            "path TEXT NOT NULL, kind TEXT NOT NULL, rate INTEGER NOT NULL, "
+            "mtime INTEGER NOT NULL, size INTEGER NOT NULL, file TEXT NOT NULL, "
+            "PRIMARY KEY (path, kind, rate))"
+        )
+        self._conn.commit()
+
+    def __getstate__(self):
+        return {"root": self.root}
+
+    def __setstate__(self, state):
+        self.__init__(state["root"])
+
+    def get(
+        self, path: str, kind: str, rate: int | None = None
+    ) -> tuple[np.ndarray, int] | None:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        query = (
+            "SELECT file, rate FROM features WHERE path = ? AND kind = ? "
+            "AND mtime = ? AND size = ?"
+        )
+        args = [path, kind, stat.st_mtime_ns, stat.st_size]
+        if rate is not None:
+            query += " AND rate = ?"
+            args.append(rate)
+        with self._lock:
+            row = self._conn.execute(query, args).fetchone()
+        if row is None or not os.path.exists(os.path.join(self.root, row[0])):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return np.load(os.path.join(self.root, row[0]), mmap_mode="r"), row[1]
+
+    def put(self, path: str, kind: str, rate: int, array: np.ndarray) -> np.ndarray:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = f"{path}\x00{stat.st_mtime_ns}\x00{stat.st_size}\x00{kind}\x00{rate}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        name = os.path.join(digest[:2], f"{digest[2:]}.npy")
+        target = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, np.ascontiguousarray(array, dtype=np.float32))
+        os.replace(temporary, target)
+
+        with self._lock:
+            stale = self._conn.execute(
+                "SELECT file FROM features WHERE path = ? AND kind = ? AND rate = ?",
+                (path, kind, rate),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?)",
+                (path, kind, rate, stat.st_mtime_ns, stat.st_size, name),
+            )
+            self._conn.commit()
+        if stale is not None and stale[0] != name:
+            try:
+                os.remove(os.path.join(self.root, stale[0]))
+            except FileNotFoundError:
+                pass
+        return np.load(target, mmap_mode="r")
+
+    def close(self):
+        self._conn.close()
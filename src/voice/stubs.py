@@ -0,0 +1,52 @@
+import numpy as np
+
+from voice.audio import AudioClip
+from voice.models import VoiceEmotionModel
+
+TRANSCRIPT_WORDS = (
+    "i", "really", "think", "this", "game", "is", "not", "very", "good", "great",
+    "and", "we", "played", "it", "for", "hours", "the", "story", "was", "boring",
+)
+
+
+class StubSpeechToTextModel:
+    MODEL_ID = "stub"
+
+    def __init__(self, device: str | None = None, backend: str = "stub"):
+        self.backend = backend
+        self.sampling_rate = 16000
+
+    def transcribe(self, audio: str | AudioClip) -> str:
+        if not isinstance(audio, AudioClip):
+            audio = AudioClip.load(audio)
+        waveform = audio.at(self.sampling_rate)
+        frames = max(len(waveform) // self.sampling_rate, 5)
+        words = [
+            TRANSCRIPT_WORDS[int(np.abs(part).mean() * 1e4) % len(TRANSCRIPT_WORDS)]
+            if len(part)
+            else TRANSCRIPT_WORDS[0]
+            for part in np.array_split(waveform, frames)
+        ]
+        return " ".join(words).capitalize() + "."
+
+    def transcribe_many(self, clips: list[AudioClip]) -> list[str]:
+        return [self.transcribe(clip) for clip in clips]
+
+
+class StubVoiceEmotionModel(VoiceEmotionModel):
+    MODEL_ID = "stub"
+    LABELS = ("neu", "hap", "ang", "sad")
+
+    def __init__(self, device: str | None = None, backend: str = "stub"):
+        self.backend = backend
+        self.sampling_rate = 16000
+
+    def predict(self, audio: str | AudioClip) -> dict:
+        if not isinstance(audio, AudioClip):
+            audio = AudioClip.load(audio)
+        rms = float(np.sqrt(np.mean(np.square(audio.at(self.sampling_rate)))))
+        label = self.LABELS[int(rms * 100) % len(self.LABELS)]
+        return self._dimensions([{"label": label, "score": min(rms * 10, 1.0)}])
+
+    def predict_many(self, clips: list[AudioClip]) -> list[dict]:
+        return [self.predict(clip) for clip in clips]
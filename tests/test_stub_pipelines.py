@@ -0,0 +1,40 @@
+import pytest
+
+for module in ("numpy", "pandas", "torch", "textblob", "spacy", "language_tool_python"):
+    pytest.importorskip(module)
+
+
+def test_text_pipeline_builds_and_analyzes_with_stub_backend():
+    from text.pipeline import TextAnalysisPipeline
+
+    pipeline = TextAnalysisPipeline(device="cpu", backend="stub")
+    results = pipeline.analyze_many(["I really love this game.", "It is not good."])
+
+    assert [result["original_text"] for result in results] == [
+        "I really love this game.",
+        "It is not good.",
+    ]
+    for result in results:
+        analysis = result["analysis"]
+        assert {"polarity", "subjectivity", "emotion", "statement_type"} <= set(analysis)
+        assert analysis["emotion"]["label"] in pipeline.emotion.pad_mapping
+    assert pipeline.analyze("I really love this game.") == results[0]
+
+
+def test_audio_pipeline_builds_and_analyzes_with_stub_backend(tmp_path):
+    np = pytest.importorskip("numpy")
+    sf = pytest.importorskip("soundfile")
+    pytest.importorskip("librosa")
+    from voice.pipeline import VoiceAnalysisPipeline
+
+    path = str(tmp_path / "clip.wav")
+    t = np.linspace(0, 2, 32000, endpoint=False)
+    sf.write(path, (0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), 16000)
+
+    pipeline = VoiceAnalysisPipeline(device="cpu", backend="stub")
+    result = pipeline.analyze(path)
+
+    assert result["audio_path"] == path
+    assert result["transcription"]
+    assert result["voice_emotion"]["label"] in pipeline.voice_emotion.pad_mapping
+    assert result["text_analysis"]["original_text"] == result["transcription"]